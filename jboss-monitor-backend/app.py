@@ -1,8 +1,8 @@
 # app.py
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
-from threading import Thread
 import time
 import logging
 from datetime import datetime
@@ -19,6 +19,22 @@ logger = logging.getLogger(__name__)
 # Import config
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Serialize jsonify() responses with orjson; types it doesn't handle go through Flask's default"""
+    def dumps(self, obj, **kwargs):
+        # Datetimes are passed through so they keep Flask's HTTP date format
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
 # Try to set up advanced logging
 try:
     from logging_config import setup_logging
@@ -57,6 +73,8 @@ logger.info("Starting JBoss Monitor application")
 
 app = Flask(__name__)
 app.config.from_object(Config)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 
 # Record start time
 app.start_time = time.time()
@@ -141,31 +159,23 @@ if __name__ == '__main__':
     # Create required directories
     create_directories()
     
-    # Start log cleanup thread if available
+    # Schedule log cleanup if available; it runs on the shared scheduler thread
     if use_log_cleanup:
         try:
-            logger.info("Starting log cleanup worker")
-            cleanup_thread = Thread(target=start_log_cleanup_worker)
-            cleanup_thread.daemon = True
-            cleanup_thread.start()
+            start_log_cleanup_worker()
         except Exception as e:
             logger.error(f"Error starting log cleanup worker: {str(e)}")
     
-    # Start reports cleanup thread if available
+    # Schedule reports cleanup if available
     if use_reports_cleanup and Config.REPORTS_CLEANUP_ENABLED:
         try:
-            logger.info("Starting reports cleanup worker")
-            reports_cleanup_thread = Thread(target=start_reports_cleanup_worker)
-            reports_cleanup_thread.daemon = True
-            reports_cleanup_thread.start()
+            start_reports_cleanup_worker()
         except Exception as e:
             logger.error(f"Error starting reports cleanup worker: {str(e)}")
     
-    # Start background monitoring thread
+    # Start background monitoring thread; called from the main thread so it can install its SIGHUP handler
     logger.info("Starting monitoring worker")
-    monitoring_thread = Thread(target=start_monitoring_worker)
-    monitoring_thread.daemon = True
-    monitoring_thread.start()
+    start_monitoring_worker()
     
     # Log server startup
     port = int(os.environ.get('PORT', 5000))
@@ -5,6 +5,9 @@ import json
 import uuid
 import hashlib
 import jwt
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 
@@ -36,6 +39,30 @@ def save_user(user_data):
     with open(user_file, 'w') as f:
         json.dump(user_data, f)
 
+# Verified token payloads by raw token, so polling clients skip the signature check
+_TOKEN_CACHE_SIZE = 1024
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def decode_token(token):
+    """Decode and verify a JWT, reusing the payload of a token seen before until it expires"""
+    with _token_cache_lock:
+        data = _token_cache.get(token)
+        if data is not None:
+            if data.get('exp', 0) > time.time():
+                _token_cache.move_to_end(token)
+                return data
+            del _token_cache[token]
+
+    # Raises for a bad signature or an expired token; only valid tokens are cached
+    data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+    if 'exp' in data:
+        with _token_cache_lock:
+            _token_cache[token] = data
+            if len(_token_cache) > _TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return data
+
 def token_required(f):
     """Decorator to check for valid JWT token"""
     @wraps(f)
@@ -48,7 +75,7 @@ def token_required(f):
             return jsonify({'message': 'Token is missing'}), 401
         
         try:
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+            data = decode_token(token)
             current_user = get_user_by_username(data['username'])
             if not current_user:
                 return jsonify({'message': 'User not found'}), 401
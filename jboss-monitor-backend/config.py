@@ -5,6 +5,7 @@ from datetime import timedelta
 class Config:
     # Flask configuration
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'False').lower() in ('true', '1', 't')  # Let a front-end server that supports X-Sendfile send report downloads
     
     # Authentication settings
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
@@ -22,6 +23,8 @@ class Config:
     # Monitoring settings
     MONITORING_INTERVAL = int(os.environ.get('MONITORING_INTERVAL') or 15)  # in seconds (reduced for more responsiveness)
     CLI_TIMEOUT = int(os.environ.get('CLI_TIMEOUT') or 30)  # CLI command timeout in seconds
+    CLI_CONNECT_TIMEOUT = int(os.environ.get('CLI_CONNECT_TIMEOUT') or 15)  # Controller connection timeout in seconds
+    MAX_ACCUMULATED_POLL_SECONDS = int(os.environ.get('MAX_ACCUMULATED_POLL_SECONDS') or 60)  # Lag after which missed cycles are skipped instead of caught up
     
     # JBoss CLI Credentials from Environment Variables
     PROD_JBOSS_USERNAME = os.environ.get('PROD_JBOSS_USERNAME')
@@ -32,13 +35,20 @@ class Config:
     # Multithreading settings - improved for better parallelism
     MAX_WORKERS = int(os.environ.get('MAX_WORKERS') or 20)  # Maximum number of worker threads
     MAX_CONCURRENT_HOSTS = int(os.environ.get('MAX_CONCURRENT_HOSTS') or 0)  # 0 means no limit
+    MIN_WORKERS = int(os.environ.get('MIN_WORKERS') or 2)  # Lower bound for the adaptive worker count
     
     # Status file updates
     STATUS_UPDATE_LOCK_TIMEOUT = int(os.environ.get('STATUS_UPDATE_LOCK_TIMEOUT') or 10)  # Lock timeout for status file updates in seconds
+    STATUS_WAL_CHECKPOINT_BYTES = int(os.environ.get('STATUS_WAL_CHECKPOINT_BYTES') or 1048576)  # Fold single-host updates into the shards once the WAL reaches this size
+    PERSIST_HEARTBEAT_SEC = int(os.environ.get('PERSIST_HEARTBEAT_SEC') or 300)  # Rewrite an unchanged status file at least this often
     
     # Performance tweaks
     CLI_CONNECTION_POOL_SIZE = int(os.environ.get('CLI_CONNECTION_POOL_SIZE') or 10)  # Size of the connection pool for CLI commands
     
+    # Response compression for monitor status payloads
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 1024)  # Only gzip bodies larger than this (bytes)
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 5)  # gzip compression level (1-9)
+    
     # Logging configuration
     LOG_DIR = os.environ.get('LOG_DIR') or '/app/jbossmonit/logs'
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
@@ -49,3 +59,9 @@ class Config:
     # Reports settings
     MAX_REPORTS_PER_ENV = int(os.environ.get('MAX_REPORTS_PER_ENV') or 10)  # Maximum number of reports to keep per environment
     REPORTS_CLEANUP_ENABLED = os.environ.get('REPORTS_CLEANUP_ENABLED', 'True').lower() in ('true', '1', 't')  # Enable reports cleanup
+    REPORT_CONCURRENCY = int(os.environ.get('REPORT_CONCURRENCY') or 2)  # Reports generated at the same time; further requests wait
+    REPORTS_INDEX_LOCK_TIMEOUT = int(os.environ.get('REPORTS_INDEX_LOCK_TIMEOUT') or 10)  # Lock timeout for reports index updates in seconds
+    PDF_RENDER_PROCESSES = int(os.environ.get('PDF_RENDER_PROCESSES') or 0)  # Processes laying out large PDF reports; 0 means one per CPU
+    PDF_PARALLEL_MIN_HOSTS = int(os.environ.get('PDF_PARALLEL_MIN_HOSTS') or 100)  # Render PDF details in parallel from this many hosts
+    PDF_BATCH_HOSTS = int(os.environ.get('PDF_BATCH_HOSTS') or 50)  # Hosts per detail part when rendering in parallel; 0 means one part per process
+    PDF_MAX_DETAIL_HOSTS = int(os.environ.get('PDF_MAX_DETAIL_HOSTS') or 500)  # Leave out per-host detail pages above this many hosts; 0 means no limit
@@ -1,11 +1,10 @@
 # log_cleanup.py
 import os
-import time
-import threading
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 import glob
 from config import Config
+from scheduler import register_daily
 
 logger = logging.getLogger(__name__)
 
@@ -56,44 +55,6 @@ def cleanup_old_logs():
         logger.error(f"Error during log cleanup: {str(e)}")
 
 def start_log_cleanup_worker():
-    """Start a background thread to periodically clean up old log files"""
-    
-    def run_cleanup():
-        logger.info("Starting log cleanup worker")
-        
-        while True:
-            try:
-                # Run cleanup
-                cleanup_old_logs()
-                
-                # Wait for next cleanup (once per day at 2 AM)
-                now = datetime.now()
-                next_run = now.replace(hour=2, minute=0, second=0, microsecond=0)
-                
-                # If it's already past 2 AM, schedule for tomorrow
-                if now.hour >= 2:
-                    next_run = next_run + timedelta(days=1)
-                
-                # Calculate seconds until next run
-                sleep_seconds = (next_run - now).total_seconds()
-                
-                # Make sure we don't have a negative sleep time
-                if sleep_seconds <= 0:
-                    sleep_seconds = 86400  # 24 hours
-                
-                logger.info(f"Next log cleanup scheduled for {next_run} (in {sleep_seconds/3600:.2f} hours)")
-                
-                # Sleep until next cleanup time
-                time.sleep(sleep_seconds)
-                
-            except Exception as e:
-                logger.error(f"Error in log cleanup worker: {str(e)}")
-                # If there's an error, wait 1 hour before retrying
-                time.sleep(3600)
-    
-    # Create and start the cleanup thread
-    cleanup_thread = threading.Thread(target=run_cleanup)
-    cleanup_thread.daemon = True
-    cleanup_thread.start()
-    
-    return cleanup_thread
+    """Schedule the log cleanup to run now and then once per day at 2 AM"""
+    logger.info("Starting log cleanup worker")
+    return register_daily(2, 0, cleanup_old_logs, name="log cleanup")
@@ -1,4 +1,5 @@
 # monitor/cli_executor.py
+import asyncio
 import subprocess
 import tempfile
 import os
@@ -6,11 +7,17 @@ import json
 import logging
 import time
 import shlex
+import signal
 import traceback
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Thread-local storage for CLI command caching
 thread_local = threading.local()
 
@@ -25,6 +32,19 @@ class JBossCliExecutor:
     _cache = {}
     _cache_lock = threading.RLock()
     
+    # Datasource status needs each datasource's attributes, so that read stays recursive.
+    # Deployment status only uses top-level attributes (enabled, runtime-name), so the
+    # per-deployment subsystem trees are not requested.
+    DATASOURCES_COMMAND = "/subsystem=datasources:read-resource(recursive=true)"
+    DEPLOYMENTS_COMMAND = "/deployment=*:read-resource(recursive=false)"
+    
+    # Commands a monitoring pass runs against every host, in order
+    HOST_CHECK_COMMANDS = (
+        ":read-attribute(name=server-state)",
+        DATASOURCES_COMMAND,
+        DEPLOYMENTS_COMMAND
+    )
+    
     def __init__(self, host, port, username, password, timeout=None):
         self.host = host
         self.port = port
@@ -50,6 +70,218 @@ class JBossCliExecutor:
                 masked_command[i] = '--password=****'
         return masked_command
 
+    def _connection_args(self):
+        """jboss-cli.sh arguments shared by single commands and batch scripts"""
+        return [
+            self.jboss_cli_path,
+            "--connect",
+            f"--controller={self.host}:{self.port}",
+            f"--user={self.username}",
+            f"--password={self.password}",
+            f"--timeout={Config.CLI_CONNECT_TIMEOUT * 1000}",  # Connection timeout in ms
+            "--output-json"  # Add this to force JSON output
+        ]
+
+    def _build_cli_command(self, command):
+        """Build the jboss-cli.sh argument list for a command"""
+        return self._connection_args() + [f"--command={command}"]
+
+    def _parse_output(self, output):
+        """Turn raw CLI stdout into a result dict"""
+        self.logger.debug("Raw CLI output: %s", output)
+        
+        # Try to parse as JSON if possible
+        try:
+            # Specific parsing for JBoss CLI output
+            if output.startswith("{"):
+                # Check for JBoss CLI specific outcome
+                parsed = orjson.loads(output) if orjson is not None else json.loads(output)
+                return self._outcome_result(parsed)
+        except ValueError:
+            self.logger.warning("Failed to parse JSON from output: %s", output)
+        
+        # If not JSON but contains "outcome" => "success", try to parse it
+        if ' => "success"' in output or " => 'success'" in output:
+            self.logger.info("Output appears to be in DMR format, treating as success")
+            return {
+                "success": True,
+                "result": self._parse_dmr_output(output)
+            }
+        return {
+            "success": True,
+            "result": output
+        }
+
+    def _outcome_result(self, parsed):
+        """Map a decoded JBoss CLI JSON response to a result dict"""
+        if parsed.get('outcome') == 'success':
+            return {
+                "success": True,
+                "result": parsed.get('result')
+            }
+        return {
+            "success": False,
+            "error": parsed
+        }
+
+    def _cache_results(self, commands, results):
+        """Store cacheable batch results under the per-command keys execute_command reads"""
+        now = time.time()
+        with self._cache_lock:
+            for command, result in zip(commands, results):
+                if command.startswith(":read-") or command.startswith("/subsystem="):
+                    self._cache[f"{self.connection_id}:{command}"] = (now, result)
+
+    def _write_batch_script(self, commands):
+        """Write commands to a temporary CLI script, one per line"""
+        fd, script_path = tempfile.mkstemp(prefix='jboss-batch-', suffix='.cli')
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n'.join(commands) + '\n')
+        return script_path
+
+    def _build_batch_command(self, script_path):
+        """Build the jboss-cli.sh argument list for running a script file"""
+        return self._connection_args() + [f"--file={script_path}"]
+
+    def _split_batch_output(self, output, expected):
+        """
+        Split concatenated JSON responses from a batch run
+
+        Returns one result dict per command, or None if the output does not
+        contain exactly the expected number of JSON documents.
+        """
+        decoder = json.JSONDecoder()
+        results = []
+        pos = 0
+        length = len(output)
+        try:
+            while pos < length:
+                while pos < length and output[pos].isspace():
+                    pos += 1
+                if pos >= length:
+                    break
+                parsed, pos = decoder.raw_decode(output, pos)
+                if not isinstance(parsed, dict):
+                    return None
+                results.append(self._outcome_result(parsed))
+        except json.JSONDecodeError:
+            return None
+        return results if len(results) == expected else None
+
+    async def _kill_process_group(self, process):
+        """
+        Kill a CLI process started with start_new_session, including its children
+
+        jboss-cli.sh execs a JVM that inherits the output pipes, so killing only
+        the shell would leave the wait blocked until the JVM exits on its own.
+        """
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+        await process.wait()
+
+    def _timeout_results(self, count):
+        error = f"Command timed out after {self.timeout} seconds"
+        self.logger.error(error)
+        return [{"success": False, "error": error} for _ in range(count)]
+
+    def run_batch(self, commands, use_cache=True, cache_ttl=60):
+        """
+        Run several read-only CLI commands in a single jboss-cli invocation
+
+        Returns one result per command, in order, so a host costs one CLI
+        startup and connection instead of one per command. Returns None when
+        the batch could not be run or split, so callers can fall back to
+        individual commands. A timeout fails every command, since running
+        them one by one would only time out again.
+        """
+        commands = list(commands)
+        if os.environ.get('JBOSS_SIMULATION_MODE') == 'true' or not os.path.exists(self.jboss_cli_path):
+            return [self.execute_command(command, use_cache, cache_ttl) for command in commands]
+        
+        script_path = self._write_batch_script(commands)
+        try:
+            cli_command = self._build_batch_command(script_path)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Executing CLI batch of %s commands: %s", len(commands), ' '.join(self._mask_sensitive_data(cli_command)))
+            
+            start_time = time.time()
+            process = subprocess.run(
+                cli_command,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                shell=False
+            )
+            self.logger.debug("CLI batch executed in %.2fs", time.time() - start_time)
+            
+            if process.returncode != 0:
+                self.logger.warning("CLI batch failed: %s", process.stderr)
+                return None
+            results = self._split_batch_output(process.stdout, len(commands))
+        except subprocess.TimeoutExpired:
+            return self._timeout_results(len(commands))
+        except Exception as e:
+            self.logger.error("Error executing CLI batch: %s", e)
+            return None
+        finally:
+            os.unlink(script_path)
+        
+        if results is None:
+            self.logger.warning("Could not split CLI batch output for %s:%s", self.host, self.port)
+            return None
+        if use_cache:
+            self._cache_results(commands, results)
+        return results
+
+    async def run_batch_async(self, commands, use_cache=True, cache_ttl=60):
+        """Async variant of run_batch"""
+        commands = list(commands)
+        if os.environ.get('JBOSS_SIMULATION_MODE') == 'true' or not os.path.exists(self.jboss_cli_path):
+            return [self.execute_command(command, use_cache, cache_ttl) for command in commands]
+        
+        script_path = self._write_batch_script(commands)
+        try:
+            cli_command = self._build_batch_command(script_path)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Executing CLI batch of %s commands: %s", len(commands), ' '.join(self._mask_sensitive_data(cli_command)))
+            
+            start_time = time.time()
+            process = await asyncio.create_subprocess_exec(
+                *cli_command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.CancelledError:
+                # The caller gave up on this host, don't leave the CLI process behind
+                await self._kill_process_group(process)
+                raise
+            except asyncio.TimeoutError:
+                await self._kill_process_group(process)
+                return self._timeout_results(len(commands))
+            self.logger.debug("CLI batch executed in %.2fs", time.time() - start_time)
+            
+            if process.returncode != 0:
+                self.logger.warning("CLI batch failed: %s", stderr.decode(errors='replace'))
+                return None
+            results = self._split_batch_output(stdout.decode(errors='replace'), len(commands))
+        except Exception as e:
+            self.logger.error("Error executing CLI batch: %s", e)
+            return None
+        finally:
+            os.unlink(script_path)
+        
+        if results is None:
+            self.logger.warning("Could not split CLI batch output for %s:%s", self.host, self.port)
+            return None
+        if use_cache:
+            self._cache_results(commands, results)
+        return results
+
     def execute_command(self, command, use_cache=True, cache_ttl=60):
         """Execute a JBoss CLI command and return the result with caching support"""
         # Generate a cache key for this command
@@ -63,7 +295,7 @@ class JBossCliExecutor:
                     cache_time, cache_result = cache_entry
                     # Check if cache is still valid
                     if time.time() - cache_time < cache_ttl:
-                        self.logger.debug(f"Using cached result for: {command}")
+                        self.logger.debug("Using cached result for: %s", command)
                         return cache_result
         
         try:
@@ -78,7 +310,7 @@ class JBossCliExecutor:
 
             # Verify jboss-cli.sh exists
             if not os.path.exists(self.jboss_cli_path):
-                self.logger.error(f"JBoss CLI not found at {self.jboss_cli_path}")
+                self.logger.error("JBoss CLI not found at %s", self.jboss_cli_path)
                 # For development/testing when jboss-cli.sh might not be available
                 if os.environ.get('JBOSS_FALLBACK_SIMULATION') == 'true':
                     self.logger.warning("Using fallback simulation mode due to missing CLI executable")
@@ -92,20 +324,11 @@ class JBossCliExecutor:
                     "error": f"JBoss CLI not found at {self.jboss_cli_path}"
                 }
 
-            # Build the CLI command with exact syntax
-            cli_command = [
-                self.jboss_cli_path,
-                "--connect",
-                f"--controller={self.host}:{self.port}",
-                f"--user={self.username}",
-                f"--password={self.password}",
-                "--output-json",  # Add this to force JSON output
-                f"--command={command}"
-            ]
+            cli_command = self._build_cli_command(command)
             
             # Log masked command for security
-            masked_cli_command = self._mask_sensitive_data(cli_command)
-            self.logger.info(f"Executing CLI command: {' '.join(masked_cli_command)}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Executing CLI command: %s", ' '.join(self._mask_sensitive_data(cli_command)))
             
             # Execute the command with timeout
             start_time = time.time()
@@ -118,93 +341,118 @@ class JBossCliExecutor:
                 shell=False
             )
             execution_time = time.time() - start_time
-            self.logger.debug(f"CLI command executed in {execution_time:.2f}s")
+            self.logger.debug("CLI command executed in %.2fs", execution_time)
             
             # Check for errors
             if process.returncode != 0:
-                self.logger.error(f"CLI Error: {process.stderr}")
+                self.logger.error("CLI Error: %s", process.stderr)
                 return {
                     "success": False,
                     "error": process.stderr,
                     "output": process.stdout
                 }
             
-            # Parse the output
-            output = process.stdout.strip()
-            self.logger.debug(f"Raw CLI output: {output}")
+            result = self._parse_output(process.stdout.strip())
             
-            # Try to parse as JSON if possible
-            try:
-                # Specific parsing for JBoss CLI output
-                if output.startswith("{"):
-                    result = json.loads(output)
-                    # Check for JBoss CLI specific outcome
-                    if result.get('outcome') == 'success':
-                        result = {
-                            "success": True,
-                            "result": result.get('result')
-                        }
-                    else:
-                        result = {
-                            "success": False,
-                            "error": result
-                        }
-                else:
-                    # If not JSON but contains "outcome" => "success", try to parse it
-                    if ' => "success"' in output or " => 'success'" in output:
-                        self.logger.info("Output appears to be in DMR format, treating as success")
-                        result = {
-                            "success": True,
-                            "result": self._parse_dmr_output(output)
-                        }
-                    else:
-                        result = {
-                            "success": True,
-                            "result": output
-                        }
-                
-                # Cache the result for read-only commands
-                if use_cache and (command.startswith(":read-") or command.startswith("/subsystem=")):
-                    with self._cache_lock:
-                        self._cache[cache_key] = (time.time(), result)
-                
-                return result
-            except json.JSONDecodeError:
-                self.logger.warning(f"Failed to parse JSON from output: {output}")
-                # Try to parse non-JSON CLI output
-                if ' => "success"' in output or " => 'success'" in output:
-                    self.logger.info("Output appears to be in DMR format, treating as success")
-                    result = {
-                        "success": True,
-                        "result": self._parse_dmr_output(output)
-                    }
-                else:
-                    result = {
-                        "success": True,
-                        "result": output
-                    }
-                
-                # Cache the result for read-only commands
-                if use_cache and (command.startswith(":read-") or command.startswith("/subsystem=")):
-                    with self._cache_lock:
-                        self._cache[cache_key] = (time.time(), result)
-                
-                return result
+            # Cache the result for read-only commands
+            if use_cache and (command.startswith(":read-") or command.startswith("/subsystem=")):
+                with self._cache_lock:
+                    self._cache[cache_key] = (time.time(), result)
+            
+            return result
         
         except subprocess.TimeoutExpired:
-            self.logger.error(f"Command timed out after {self.timeout} seconds")
+            self.logger.error("Command timed out after %s seconds", self.timeout)
             return {
                 "success": False,
                 "error": f"Command timed out after {self.timeout} seconds"
             }
         except FileNotFoundError:
-            self.logger.error(f"JBoss CLI executable not found: {self.jboss_cli_path}")
+            self.logger.error("JBoss CLI executable not found: %s", self.jboss_cli_path)
             return {
                 "success": False,
                 "error": f"JBoss CLI executable not found: {self.jboss_cli_path}"
             }
         except Exception as e:
-            self.logger.error(f"Error executing CLI command: {str(e)}")
+            self.logger.error("Error executing CLI command: %s", e)
+            self.logger.error(traceback.format_exc())
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def execute_command_async(self, command, use_cache=True, cache_ttl=60):
+        """
+        Async variant of execute_command
+
+        Awaits the CLI subprocess on the event loop instead of blocking a
+        thread, so many hosts can be polled concurrently from one thread.
+        """
+        cacheable = use_cache and (command.startswith(":read-") or command.startswith("/subsystem="))
+        cache_key = f"{self.connection_id}:{command}"
+        
+        if cacheable:
+            with self._cache_lock:
+                cache_entry = self._cache.get(cache_key)
+            if cache_entry and time.time() - cache_entry[0] < cache_ttl:
+                self.logger.debug("Using cached result for: %s", command)
+                return cache_entry[1]
+        
+        # Simulated and missing-CLI responses don't block, reuse the sync path
+        if os.environ.get('JBOSS_SIMULATION_MODE') == 'true' or not os.path.exists(self.jboss_cli_path):
+            return self.execute_command(command, use_cache, cache_ttl)
+        
+        try:
+            cli_command = self._build_cli_command(command)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Executing CLI command: %s", ' '.join(self._mask_sensitive_data(cli_command)))
+            
+            start_time = time.time()
+            process = await asyncio.create_subprocess_exec(
+                *cli_command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.CancelledError:
+                # The caller gave up on this host, don't leave the CLI process behind
+                await self._kill_process_group(process)
+                raise
+            except asyncio.TimeoutError:
+                await self._kill_process_group(process)
+                self.logger.error("Command timed out after %s seconds", self.timeout)
+                return {
+                    "success": False,
+                    "error": f"Command timed out after {self.timeout} seconds"
+                }
+            execution_time = time.time() - start_time
+            self.logger.debug("CLI command executed in %.2fs", execution_time)
+            
+            stdout = stdout.decode(errors='replace')
+            stderr = stderr.decode(errors='replace')
+            if process.returncode != 0:
+                self.logger.error("CLI Error: %s", stderr)
+                return {
+                    "success": False,
+                    "error": stderr,
+                    "output": stdout
+                }
+            
+            result = self._parse_output(stdout.strip())
+            if cacheable:
+                with self._cache_lock:
+                    self._cache[cache_key] = (time.time(), result)
+            return result
+        except FileNotFoundError:
+            self.logger.error("JBoss CLI executable not found: %s", self.jboss_cli_path)
+            return {
+                "success": False,
+                "error": f"JBoss CLI executable not found: {self.jboss_cli_path}"
+            }
+        except Exception as e:
+            self.logger.error("Error executing CLI command: %s", e)
             self.logger.error(traceback.format_exc())
             return {
                 "success": False,
@@ -281,7 +529,7 @@ class JBossCliExecutor:
             # Default - return the raw output
             return output
         except Exception as e:
-            self.logger.error(f"Error parsing DMR output: {str(e)}")
+            self.logger.error("Error parsing DMR output: %s", e)
             self.logger.error(traceback.format_exc())
             return output
 
@@ -289,7 +537,7 @@ class JBossCliExecutor:
         """
         Return simulated responses for development/testing without JBoss server
         """
-        self.logger.info(f"Using simulated response for command: {command}")
+        self.logger.info("Using simulated response for command: %s", command)
         
         if ":read-attribute(name=server-state)" in command:
             return {
@@ -363,7 +611,19 @@ class JBossCliExecutor:
 
     def get_datasources(self):
         """Get list of datasources"""
-        return self.execute_command("/subsystem=datasources:read-resource(recursive=true)")
+        return self.execute_command(self.DATASOURCES_COMMAND)
+
+    async def check_server_status_async(self):
+        """Async variant of check_server_status"""
+        return await self.execute_command_async(":read-attribute(name=server-state)")
+
+    async def get_datasources_async(self):
+        """Async variant of get_datasources"""
+        return await self.execute_command_async(self.DATASOURCES_COMMAND)
+
+    async def get_deployments_async(self):
+        """Async variant of get_deployments"""
+        return await self.execute_command_async(self.DEPLOYMENTS_COMMAND)
 
     def check_datasource_connection(self, datasource_name):
         """Test connection to a datasource"""
@@ -371,7 +631,7 @@ class JBossCliExecutor:
 
     def get_deployments(self):
         """Get list of deployed applications (supporting all types, not just .war)"""
-        return self.execute_command("/deployment=*:read-resource(recursive=true)")
+        return self.execute_command(self.DEPLOYMENTS_COMMAND)
 
     def check_deployment_status(self, deployment_name):
         """Check if a deployment is enabled and running"""
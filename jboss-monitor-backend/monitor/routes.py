@@ -1,6 +1,8 @@
 # monitor/routes.py
 from flask import Blueprint, request, jsonify
 import os
+import gzip
+import functools
 import threading
 import time
 import logging
@@ -10,48 +12,59 @@ from auth.routes import token_required
 from config import Config
 from hosts.routes import load_hosts
 from monitor.utils import (
-    get_status_file, load_status, save_status, 
+    get_status_file, status_mtime, load_status, append_status_delta, enqueue_status, 
     get_jboss_credentials, parse_datasources, parse_deployments
 )
-from monitor.tasks import monitor_host_worker
+from monitor.tasks import monitor_host_worker, get_executor, get_pool_metrics
+from monitor.status_cache import status_cache
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 monitor_bp = Blueprint('monitor', __name__)
 
+@monitor_bp.after_request
+def compress_response(response):
+    """Gzip JSON responses when the client supports it and the body is large enough"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json'
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
 def monitor_host(environment, host, username, password):
     """Monitor a single host and update its status"""
     host_id = host['id']
-    logger.info(f"Starting monitoring for host: {host['host']}:{host['port']}")
+    logger.info("Starting monitoring for host: %s:%s", host['host'], host['port'])
     
     # Get host status
-    host_status = monitor_host_worker(host, username, password)
-    
-    # Load current status
-    status = load_status(environment)
-    
-    # Check if status changed
-    previous_status = status.get(host_id, {})
-    
-    # Update status with this host's status
-    status[host_id] = host_status
-    
-    # Add metadata for this update
-    status['_single_host_updated'] = host_id
-    status['_single_host_updated_at'] = datetime.now().isoformat()
+    status_cache.refresh(environment)
+    host_status = monitor_host_worker(host, username, password, status_cache.get_host(environment, host_id))
     
-    # Save updated status
-    save_status(status, environment)
+    # Queue this host's status with metadata for the update; no need to load or rewrite the rest
+    enqueue_status(environment, host_id, host_status, meta={
+        '_single_host_updated': host_id,
+        '_single_host_updated_at': datetime.now().isoformat()
+    })
     
-    logger.info(f"Completed monitoring for host: {host['host']}:{host['port']}")
+    logger.info("Completed monitoring for host: %s:%s", host['host'], host['port'])
     
     return host_status
 
+def monitor_host_inmem(environment, host, username, password):
+    """Check a single host and return its status without persisting it"""
+    return monitor_host_worker(host, username, password, status_cache.get_host(environment, host['id']))
+
 @monitor_bp.route('/<environment>/status', methods=['GET'])
 @token_required
 def get_monitor_status(current_user, environment):
@@ -61,11 +74,10 @@ def get_monitor_status(current_user, environment):
             return jsonify({'message': 'Invalid environment'}), 400
 
         # Generate ETag based on the last modification time of status file
-        status_file = get_status_file(environment)
+        file_mtime = status_mtime(environment)
         etag = None
-        if os.path.exists(status_file):
+        if file_mtime is not None:
             # Add timestamp to make ETag more unique
-            file_mtime = os.path.getmtime(status_file)
             etag = f"W/\"{file_mtime}_{int(time.time())}\""
             
             # Check if client sent If-None-Match header
@@ -94,11 +106,12 @@ def get_monitor_status(current_user, environment):
             })
 
         # Add metadata to response
+        now_iso = datetime.now().isoformat()
         metadata = {
-            'last_updated': status.get('_last_updated', datetime.now().isoformat()),
+            'last_updated': status.get('_last_updated', now_iso),
             'environment': environment,
             'host_count': len(hosts),
-            'fetch_time': datetime.now().isoformat()
+            'fetch_time': now_iso
         }
 
         # Create response with metadata
@@ -124,9 +137,7 @@ def get_monitor_status(current_user, environment):
             
         return response, 200
     except Exception as e:
-        logger.error(f"Error in get_monitor_status: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error in get_monitor_status: %s", e)
         return jsonify({'message': 'Internal server error', 'error': str(e)}), 500
 
 @monitor_bp.route('/<environment>/check/<host_id>', methods=['POST'])
@@ -155,25 +166,19 @@ def check_host(current_user, environment, host_id):
     # Create a thread to run the check in background
     def run_check():
         try:
-            logger.info(f"Running manual check for host {host['host']}:{host['port']}")
-            host_status = monitor_host_worker(host, username, password)
-            
-            # Immediately update the status file for faster feedback
-            status = load_status(environment)
-            status[host_id] = host_status
+            logger.info("Running manual check for host %s:%s", host['host'], host['port'])
+            status_cache.refresh(environment)
+            host_status = monitor_host_worker(host, username, password, status_cache.get_host(environment, host_id))
             
-            # Add metadata to indicate a manual update occurred
-            status['_manual_check'] = True
-            status['_manual_check_host'] = host_id
-            status['_manual_check_time'] = datetime.now().isoformat()
-            
-            # Save updated status
-            save_status(status, environment)
-            logger.info(f"Manual check completed for host {host['host']}:{host['port']}")
+            # Queue the update for faster feedback, with metadata to indicate a manual check
+            enqueue_status(environment, host_id, host_status, meta={
+                '_manual_check': True,
+                '_manual_check_host': host_id,
+                '_manual_check_time': datetime.now().isoformat()
+            })
+            logger.info("Manual check completed for host %s:%s", host['host'], host['port'])
         except Exception as e:
-            logger.error(f"Error in manual check thread: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Error in manual check thread: %s", e)
 
     check_thread = threading.Thread(target=run_check)
     check_thread.daemon = True
@@ -208,104 +213,114 @@ def check_all_hosts(current_user, environment):
 
     # Start a thread to run all checks in background to avoid blocking the API
     def run_checks():
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        logger.info(f"Starting parallel checks for all hosts in {environment}")
+        logger.info("Starting parallel checks for all hosts in %s", environment)
         start_time = time.time()
         
-        # Load current status
-        current_status = load_status(environment)
-        host_statuses = {}
+        # Pick up any changes made on disk by other writers before merging
+        status_cache.refresh(environment)
+        processed = 0
         status_changed = False
+        dirty = False
+        counter_lock = threading.Lock()
+        all_done = threading.Event()
         
-        # Calculate effective max workers based on config
-        max_workers = Config.MAX_WORKERS
-        if hasattr(Config, 'MAX_CONCURRENT_HOSTS') and Config.MAX_CONCURRENT_HOSTS > 0:
-            max_workers = min(max_workers, Config.MAX_CONCURRENT_HOSTS)
-        
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all host checks in parallel
-            future_to_host = {
-                executor.submit(monitor_host_worker, host, username, password): host['id']
-                for host in hosts
-            }
+        def on_host_done(future, host_id):
+            """Handle one finished host check; runs on the pool thread that completed it"""
+            nonlocal processed, status_changed, dirty
+            try:
+                host_status = future.result()
+            except Exception as e:
+                logger.exception("Error checking host %s: %s", host_id, e)
+                
+                # Add error status
+                host_status = {
+                    'instance_status': 'error',
+                    'datasources': [],
+                    'deployments': [],
+                    'last_check': datetime.now().isoformat(),
+                    'error': str(e),
+                    'status_changed': True
+                }
+            
+            # Identical results are skipped so steady-state checks cause no writes
+            changed = bool(host_status) and status_cache.update_host(environment, host_id, host_status)
             
-            # Process results as they complete
-            for future in as_completed(future_to_host):
-                host_id = future_to_host[future]
+            with counter_lock:
+                processed += 1
+                if changed:
+                    dirty = True
+                    if host_status.get('status_changed', False):
+                        status_changed = True
+                done_count = processed
+                flush_due = dirty and (done_count % 3 == 0 or done_count == len(hosts))
+                progress_changed = status_changed
+            
+            # Update status file incrementally as each host completes
+            # This provides faster feedback while the full check runs
+            if flush_due:
+                # Every 3 hosts or when all hosts are done, update the status file
                 try:
-                    host_status = future.result()
-                    if host_status:
-                        if host_status.get('status_changed', False):
-                            status_changed = True
-                        host_statuses[host_id] = host_status
-                except Exception as e:
-                    logger.error(f"Error checking host {host_id}: {str(e)}")
-                    import traceback
-                    logger.error(traceback.format_exc())
+                    now_iso = datetime.now().isoformat()
                     
-                    # Add error status
-                    host_statuses[host_id] = {
-                        'instance_status': 'error',
-                        'datasources': [],
-                        'deployments': [],
-                        'last_check': datetime.now().isoformat(),
-                        'error': str(e),
-                        'status_changed': True
+                    # Add metadata for manual check
+                    meta = {
+                        '_manual_check': True,
+                        '_manual_check_all': True,
+                        '_manual_check_time': now_iso,
+                        '_manual_check_progress': f"{done_count}/{len(hosts)}"
                     }
-                    status_changed = True
-                
-                # Update status file incrementally as each host completes
-                # This provides faster feedback while the full check runs
-                if len(host_statuses) % 3 == 0 or len(host_statuses) == len(hosts):
-                    # Every 3 hosts or when all hosts are done, update the status file
-                    try:
-                        updated_status = load_status(environment)  # Get fresh copy to avoid overwriting
-                        
-                        # Add all processed host statuses
-                        for h_id, h_status in host_statuses.items():
-                            updated_status[h_id] = h_status
-                        
-                        # Add metadata for manual check
-                        updated_status['_manual_check'] = True
-                        updated_status['_manual_check_all'] = True
-                        updated_status['_manual_check_time'] = datetime.now().isoformat()
-                        updated_status['_manual_check_progress'] = f"{len(host_statuses)}/{len(hosts)}"
-                        
-                        if status_changed:
-                            updated_status['_status_changed_at'] = datetime.now().isoformat()
-                        
-                        # Save the current progress
-                        save_status(updated_status, environment)
-                        logger.info(f"Updated status file with {len(host_statuses)}/{len(hosts)} hosts processed")
-                    except Exception as e:
-                        logger.error(f"Error updating status file during incremental update: {str(e)}")
+                    if progress_changed:
+                        meta['_status_changed_at'] = now_iso
+                    status_cache.update_meta(environment, meta)
+                    
+                    # Save the current progress
+                    status_cache.flush(environment)
+                    logger.info("Updated status file with %s/%s hosts processed", done_count, len(hosts))
+                except Exception as e:
+                    logger.error("Error updating status file during incremental update: %s", e)
+            
+            if done_count == len(hosts):
+                all_done.set()
+        
+        # Reuse the shared pool instead of spawning threads for every request
+        executor = get_executor()
+        
+        # Each future is handled and released as soon as it finishes
+        for host in hosts:
+            future = executor.submit(monitor_host_worker, host, username, password,
+                                     status_cache.get_host(environment, host['id']))
+            future.add_done_callback(functools.partial(on_host_done, host_id=host['id']))
+            del future
+        
+        all_done.wait()
         
         # Final update after all hosts are processed
         try:
-            updated_status = load_status(environment)  # Get fresh copy
-            
-            # Add all host statuses
-            for host_id, host_status in host_statuses.items():
-                updated_status[host_id] = host_status
+            if not dirty:
+                logger.info("No host status changed in %s, skipping status file write", environment)
+                return
+
+            now_iso = datetime.now().isoformat()
             
             # Add metadata for manual check
-            updated_status['_manual_check'] = True
-            updated_status['_manual_check_all'] = True
-            updated_status['_manual_check_time'] = datetime.now().isoformat()
-            updated_status['_manual_check_completed'] = datetime.now().isoformat()
-            updated_status['_manual_check_duration'] = f"{time.time() - start_time:.2f}s"
-            
+            meta = {
+                '_manual_check': True,
+                '_manual_check_all': True,
+                '_manual_check_time': now_iso,
+                '_manual_check_completed': now_iso,
+                '_manual_check_duration': f"{time.time() - start_time:.2f}s"
+            }
             if status_changed:
-                updated_status['_status_changed_at'] = datetime.now().isoformat()
+                meta['_status_changed_at'] = now_iso
+            status_cache.update_meta(environment, meta)
             
             # Save the final status
-            save_status(updated_status, environment)
+            status_cache.flush(environment)
         except Exception as e:
-            logger.error(f"Error updating status file after completing all checks: {str(e)}")
+            logger.error("Error updating status file after completing all checks: %s", e)
         
         elapsed = time.time() - start_time
-        logger.info(f"Completed all host checks in {elapsed:.2f} seconds. Processed {len(host_statuses)} hosts.")
+        logger.info("Completed all host checks in %.2f seconds. Processed %s hosts.", elapsed, processed)
 
     check_thread = threading.Thread(target=run_checks)
     check_thread.daemon = True
@@ -317,6 +332,14 @@ def check_all_hosts(current_user, environment):
         'request_time': datetime.now().isoformat()
     }), 200
 
+@monitor_bp.route('/metrics', methods=['GET'])
+@token_required
+def get_metrics(current_user):
+    """Host check pool gauges: submitted, completed, in-flight and average latency"""
+    metrics = get_pool_metrics()
+    metrics['server_time'] = datetime.now().isoformat()
+    return jsonify(metrics), 200
+
 @monitor_bp.route('/<environment>/debug', methods=['GET'])
 @token_required
 def debug_environment(current_user, environment):
@@ -410,16 +433,15 @@ def clear_host_status(current_user, environment, host_id):
     if environment not in ['production', 'non_production']:
         return jsonify({'message': 'Invalid environment'}), 400
     
-    status = load_status(environment)
+    status = load_status(environment, host_ids=[host_id])
     
     if host_id in status:
-        del status[host_id]
-        # Add metadata for this operation
-        status['_host_status_cleared'] = host_id
-        status['_host_status_cleared_at'] = datetime.now().isoformat()
-        status['_host_status_cleared_by'] = current_user['username']
-        
-        save_status(status, environment)
+        # A None entry clears the host; its shard is dropped at the next checkpoint
+        append_status_delta(host_id, None, environment, meta={
+            '_host_status_cleared': host_id,
+            '_host_status_cleared_at': datetime.now().isoformat(),
+            '_host_status_cleared_by': current_user['username']
+        })
         return jsonify({
             'message': 'Host status cleared successfully',
             'host_id': host_id,
@@ -0,0 +1,144 @@
+# monitor/status_cache.py
+import logging
+import json
+import time
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config import Config
+from monitor.utils import status_mtime, load_status, save_status
+
+logger = logging.getLogger(__name__)
+
+# Per-cycle fields that change on every check and must not count as a change
+_VOLATILE_KEYS = ('last_check', 'status_changed', 'datasources_changed_at', 'deployments_changed_at')
+
+def _status_fingerprint(status):
+    """Cheap hash of a host status, ignoring per-cycle timestamps"""
+    stable = {k: v for k, v in status.items() if k not in _VOLATILE_KEYS}
+    if orjson is not None:
+        return hash(orjson.dumps(stable, option=orjson.OPT_SORT_KEYS))
+    return hash(json.dumps(stable, sort_keys=True, default=str))
+
+class StatusCache:
+    """
+    In-memory copy of the per-environment status file
+
+    Host updates are single dict assignments, which are atomic under the GIL,
+    so they take no lock. Metadata updates touch several keys and go through a
+    small lock, and only the writer takes the write lock to snapshot the dict
+    before it is serialized to disk.
+    """
+
+    def __init__(self):
+        self._envs = {}
+        self._load_lock = threading.Lock()
+        self._meta_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _file_mtime(self, environment):
+        return status_mtime(environment)
+
+    def _get_env(self, environment):
+        env = self._envs.get(environment)
+        if env is None:
+            with self._load_lock:
+                env = self._envs.get(environment)
+                if env is None:
+                    env = {'hosts': {}, 'meta': {}, 'hashes': {}, 'written': {}, 'dirty': set(), 'mtime': None}
+                    self._merge_from_disk(environment, env)
+                    self._envs[environment] = env
+        return env
+
+    def _merge_from_disk(self, environment, env):
+        """Fold the status file into the cache, keeping hosts updated since the last flush"""
+        env['mtime'] = self._file_mtime(environment)
+        status = load_status(environment)
+        hosts = env['hosts']
+        hashes = env['hashes']
+        written = env['written']
+        dirty = env['dirty']
+
+        for key, value in status.items():
+            if key.startswith('_'):
+                continue
+            if key not in dirty:
+                hosts[key] = value
+                hashes.pop(key, None)
+                written.pop(key, None)
+
+        # Drop hosts that were cleared on disk by another writer
+        for key in list(hosts):
+            if key not in status and key not in dirty:
+                hosts.pop(key, None)
+                hashes.pop(key, None)
+                written.pop(key, None)
+
+        with self._meta_lock:
+            env['meta'] = {k: v for k, v in status.items() if k.startswith('_')}
+
+    def refresh(self, environment):
+        """Reload from disk if another writer changed the status file"""
+        env = self._get_env(environment)
+        if self._file_mtime(environment) != env['mtime']:
+            with self._load_lock:
+                self._merge_from_disk(environment, env)
+
+    def get_host(self, environment, host_id):
+        """Return the cached status for a host, or None"""
+        return self._get_env(environment)['hosts'].get(host_id)
+
+    def update_host(self, environment, host_id, status):
+        """
+        Store a host status; lock-free since dict item assignment is atomic
+
+        The cache always takes the new status, so its last_check is current.
+        Returns False without marking the host for writing when only the
+        per-check fields differ from the stored status and the host was
+        written less than PERSIST_HEARTBEAT_SEC ago, so steady-state hosts
+        cause few writes but their last check on disk never goes stale.
+        """
+        env = self._get_env(environment)
+        fingerprint = _status_fingerprint(status)
+        now = time.monotonic()
+        unchanged = env['hashes'].get(host_id) == fingerprint and host_id in env['hosts']
+        env['hosts'][host_id] = status
+        written_at = env['written'].get(host_id)
+        if unchanged and written_at is not None and now - written_at < Config.PERSIST_HEARTBEAT_SEC:
+            return False
+        env['hashes'][host_id] = fingerprint
+        env['written'][host_id] = now
+        env['dirty'].add(host_id)
+        return True
+
+    def update_meta(self, environment, meta):
+        """Update several metadata keys at once"""
+        env = self._get_env(environment)
+        with self._meta_lock:
+            env['meta'].update(meta)
+
+    def _snapshot(self, env):
+        snapshot = dict(env['hosts'])
+        with self._meta_lock:
+            snapshot.update(env['meta'])
+        return snapshot
+
+    def flush(self, environment):
+        """Write the cached status for an environment to disk"""
+        self.refresh(environment)
+        env = self._get_env(environment)
+        with self._write_lock:
+            flushed = set(env['dirty'])
+            snapshot = self._snapshot(env)
+            save_status(snapshot, environment, dirty=flushed)
+            env['dirty'].difference_update(flushed)
+            env['mtime'] = self._file_mtime(environment)
+            with self._meta_lock:
+                env['meta']['_last_updated'] = snapshot.get('_last_updated')
+
+# Shared cache used by the monitor routes
+status_cache = StatusCache()
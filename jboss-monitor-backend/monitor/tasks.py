@@ -1,76 +1,181 @@
 # monitor/tasks.py
 import os
 import json
+import math
+import hashlib
 import time
+import atexit
+import signal
+import asyncio
 import logging
 import threading
+from types import MappingProxyType
+from collections import deque
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
 
 from config import Config
 from hosts.routes import load_hosts
 from monitor.cli_executor import JBossCliExecutor
-from monitor.utils import parse_datasources, parse_deployments, load_status, save_status, get_jboss_credentials
+from monitor.utils import parse_datasources, parse_deployments, status_signature, load_status, save_status, get_jboss_credentials, load_jboss_credentials, status_mtime
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-def _datasource_status_changed(old_datasources, new_datasources):
+# Long-lived pool for manual checks, so worker threads survive between requests
+_EXECUTOR = None
+_executor_lock = threading.Lock()
+
+# Pool gauges and recent per-host check durations that drive the adaptive worker count
+_metrics_lock = threading.Lock()
+_pool_metrics = {'submitted': 0, 'completed': 0, 'in_flight': 0}
+_host_timings = deque(maxlen=Config.MAX_WORKERS * 4)
+_target_workers = None
+
+# Hosts polled per environment in the current cycle; the worker adapts once over their total
+_cycle_host_counts = {}
+
+# Per-environment polling schedule: {environment: {host_id: {'next_due': ts, 'streak_unchanged': n}}}
+_host_schedule = {}
+_MAX_BACKOFF_FACTOR = 16
+
+# Last time each environment's status file was written by the background monitor
+_last_persist = {}
+
+# Parsed status per environment with the file mtime it was read at: {environment: (mtime_ns, status)}
+_STATUS_CACHE = {}
+
+# The single background monitoring thread, guarded so repeated starts are no-ops
+_WORKER_THREAD = None
+_worker_lock = threading.Lock()
+
+# One CLI executor per host, reused across cycles
+_CLI_POOL = {}
+_CLI_POOL_LOCK = threading.Lock()
+
+# Credentials pinned when the worker starts: {environment: (username, password)}; SIGHUP reloads them
+_CREDS = MappingProxyType({})
+_RELOAD_REQUESTED = threading.Event()
+_ENVIRONMENTS = ('production', 'non_production')
+
+def effective_max_workers():
+    """Worker count from MAX_WORKERS, capped by MAX_CONCURRENT_HOSTS when set"""
+    max_workers = Config.MAX_WORKERS
+    if hasattr(Config, 'MAX_CONCURRENT_HOSTS') and Config.MAX_CONCURRENT_HOSTS > 0:
+        max_workers = min(max_workers, Config.MAX_CONCURRENT_HOSTS)
+    return max_workers
+
+def current_max_workers():
+    """Adaptive worker count, or the configured one until a cycle has been measured"""
+    return _target_workers or effective_max_workers()
+
+def get_executor():
+    """Return the shared host check pool, creating it on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _executor_lock:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=current_max_workers(),
+                    thread_name_prefix="jboss-mon"
+                )
+    return _EXECUTOR
+
+def reconfigure(max_workers):
+    """Replace the shared pool with one of a different size; running checks finish on the old one"""
+    global _EXECUTOR
+    with _executor_lock:
+        old_executor = _EXECUTOR
+        _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jboss-mon")
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+    logger.info("Host check pool resized to %s workers", max_workers)
+
+def _shutdown_executor():
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False)
+
+atexit.register(_shutdown_executor)
+
+def _record_start():
+    with _metrics_lock:
+        _pool_metrics['submitted'] += 1
+        _pool_metrics['in_flight'] += 1
+
+def _record_finish(started):
+    # deque.append is thread-safe, only the counters need the lock
+    _host_timings.append(time.time() - started)
+    with _metrics_lock:
+        _pool_metrics['completed'] += 1
+        _pool_metrics['in_flight'] -= 1
+
+def get_pool_metrics():
+    """Snapshot of the host check counters and latency gauges"""
+    with _metrics_lock:
+        metrics = dict(_pool_metrics)
+    timings = list(_host_timings)
+    metrics['avg_latency'] = round(sum(timings) / len(timings), 3) if timings else 0.0
+    metrics['target_workers'] = current_max_workers()
+    metrics['max_workers'] = effective_max_workers()
+    return metrics
+
+def _adapt_workers(host_count):
     """
-    Check if datasource status has changed
-    Returns True if any datasource status has changed, added, or removed
+    Size the worker count so a full cycle fits in 70% of MONITORING_INTERVAL
+
+    The target is only applied when it moves more than 25% away from the
+    current value, to avoid rebuilding the pool on every small fluctuation.
     """
-    # Create dictionaries for quick lookup
-    old_status = {d['name']: d['status'] for d in old_datasources}
-    new_status = {d['name']: d['status'] for d in new_datasources}
-    
-    # Check for any status changes
-    for name, status in new_status.items():
-        if name in old_status and old_status[name] != status:
-            # Status changed for an existing datasource
-            logger.info(f"Datasource '{name}' status changed from {old_status[name]} to {status}")
-            return True
+    global _host_timings, _target_workers
+    if host_count <= 0:
+        return
+    if _host_timings.maxlen != host_count * 4:
+        _host_timings = deque(_host_timings, maxlen=host_count * 4)
     
-    # Check for added or removed datasources
-    if set(old_status.keys()) != set(new_status.keys()):
-        added = set(new_status.keys()) - set(old_status.keys())
-        removed = set(old_status.keys()) - set(new_status.keys())
-        if added:
-            logger.info(f"New datasources detected: {added}")
-        if removed:
-            logger.info(f"Datasources removed: {removed}")
-        return True
+    recent = list(_host_timings)[-host_count:]
+    if not recent:
+        return
     
-    return False
+    target = math.ceil(sum(recent) / (max(Config.MONITORING_INTERVAL, 1) * 0.7))
+    target = max(Config.MIN_WORKERS, min(effective_max_workers(), target))
+    current = current_max_workers()
+    if abs(target - current) <= current * 0.25:
+        return
+    
+    logger.info("Adjusting host check workers from %s to %s", current, target)
+    _target_workers = target
+    if _EXECUTOR is not None:
+        reconfigure(target)
 
-def _deployment_status_changed(old_deployments, new_deployments):
+# Sentinel for names missing from the new item map
+_MISSING = object()
+
+def _status_changed(old_items, new_items, kind):
     """
-    Check if deployment status has changed
-    Returns True if any deployment status has changed, added, or removed
+    Check if any item status has changed, or items were added or removed
+
+    Builds one name->status map and scans the old items once, returning at
+    the first difference. Logging only happens on the (rare) change path.
     """
-    # Create dictionaries for quick lookup
-    old_status = {d['name']: d['status'] for d in old_deployments}
-    new_status = {d['name']: d['status'] for d in new_deployments}
-    
-    # Check for any status changes
-    for name, status in new_status.items():
-        if name in old_status and old_status[name] != status:
-            # Status changed for an existing deployment
-            logger.info(f"Deployment '{name}' status changed from {old_status[name]} to {status}")
+    new_status = {d['name']: d['status'] for d in new_items}
+    
+    for item in old_items:
+        status = new_status.pop(item['name'], _MISSING)
+        if status is _MISSING:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s '%s' removed", kind, item['name'])
+            return True
+        if status != item['status']:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s '%s' status changed from %s to %s", kind, item['name'], item['status'], status)
             return True
     
-    # Check for added or removed deployments
-    if set(old_status.keys()) != set(new_status.keys()):
-        added = set(new_status.keys()) - set(old_status.keys())
-        removed = set(old_status.keys()) - set(new_status.keys())
-        if added:
-            logger.info(f"New deployments detected: {added}")
-        if removed:
-            logger.info(f"Deployments removed: {removed}")
+    # Anything left over was added since the last check
+    if new_status:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("New %s entries detected: %s", kind, set(new_status))
         return True
     
     return False
@@ -79,35 +184,201 @@ def _instance_status_changed(old_status, new_status):
     """Check if the overall instance status has changed"""
     return old_status != new_status
 
-def monitor_host_worker(host, username, password):
-    """Worker function to monitor a single host and return its status (without saving to file)"""
-    host_id = host['id']
-    logger.info(f"Starting monitoring for host: {host['host']}:{host['port']}")
+def _host_result_changed(previous_status, host_status):
+    """Check if a host check produced anything different from the stored status"""
+    if not previous_status:
+        return True
+    return any(previous_status.get(key) != host_status.get(key)
+               for key in ('instance_status', 'datasources', 'deployments', 'error'))
+
+def _schedule_next_check(schedule, host_id, changed, now):
+    """Back off stable hosts exponentially, poll changed hosts again next cycle"""
+    entry = schedule.setdefault(host_id, {'next_due': 0, 'streak_unchanged': 0})
+    if changed:
+        entry['streak_unchanged'] = 0
+        entry['next_due'] = now + Config.MONITORING_INTERVAL
+    else:
+        entry['streak_unchanged'] += 1
+        factor = min(2 ** entry['streak_unchanged'], _MAX_BACKOFF_FACTOR)
+        entry['next_due'] = now + Config.MONITORING_INTERVAL * factor
+
+def _load_status_cached(environment):
+    """Return the environment status, re-parsing the file only when its mtime changed"""
+    mtime = status_mtime(environment)
+    cached = _STATUS_CACHE.get(environment)
+    if cached is not None and mtime is not None and cached[0] == mtime:
+        return cached[1]
     
-    # Initialize status for this host
-    status = {
+    status = load_status(environment)
+    _STATUS_CACHE[environment] = (mtime, status)
+    return status
+
+def _get_or_create_cli(host_id, host, username, password):
+    """Return the pooled CLI executor for a host, rebuilding it if the connection details changed"""
+    connection_id = f"{host['host']}:{host['port']}:{username}"
+    cli = _CLI_POOL.get(host_id)
+    if cli is not None and cli.connection_id == connection_id and cli.password == password:
+        return cli
+    
+    with _CLI_POOL_LOCK:
+        cli = _CLI_POOL.get(host_id)
+        if cli is None or cli.connection_id != connection_id or cli.password != password:
+            cli = JBossCliExecutor(
+                host=host['host'],
+                port=host['port'],
+                username=username,
+                password=password
+            )
+            _CLI_POOL[host_id] = cli
+    return cli
+
+def _discard_cli(host_id):
+    """Drop a host's pooled executor so the next cycle builds a fresh one"""
+    with _CLI_POOL_LOCK:
+        _CLI_POOL.pop(host_id, None)
+
+def _new_host_status(cycle_ts):
+    """Initial status for a host before any CLI call has completed"""
+    return {
         'instance_status': 'unknown',
         'datasources': [],
         'deployments': [],
-        'last_check': datetime.now().isoformat(),
+        'last_check': cycle_ts,
         'status_changed': False  # Flag to indicate if any status has changed
     }
+
+def _result_fingerprint(result):
+    """Short stable hash of a raw CLI result payload"""
+    payload = json.dumps(result, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+# (raw result fingerprint, (name, status) signature, parsed items) of the last CLI result
+# parsed per (host, port, items key). Kept out of the host status so it is never persisted
+# or served; only trusted while the previous status still holds the same items.
+_RESULT_MEMO = {}
+
+def _memo_for(memo_key, previous_status, items_key):
+    memo = _RESULT_MEMO.get(memo_key)
+    if memo is None or not previous_status or previous_status.get(items_key) != memo[2]:
+        return None
+    return memo
+
+def _reuse_previous(status, previous_status, memo_key, fingerprint, items_key, changed_at_key):
+    """Copy items from the previous status when the raw CLI result is identical"""
+    memo = _memo_for(memo_key, previous_status, items_key)
+    if memo is None or memo[0] != fingerprint:
+        return False
+    status[items_key] = previous_status[items_key]
+    if changed_at_key in previous_status:
+        status[changed_at_key] = previous_status[changed_at_key]
+    return True
+
+def _signature_unchanged(previous_status, memo_key, items_key, signature):
+    """Compare the previous items' (name, status) signature against a fresh one"""
+    memo = _memo_for(memo_key, previous_status, items_key)
+    return memo is not None and memo[1] == signature
+
+def _apply_datasources(status, host, datasources_result, previous_status, cycle_ts):
+    """Parse a datasource CLI result into the host status"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Datasource check result success: %s", datasources_result['success'])
+    
+    if datasources_result['success'] and 'result' in datasources_result:
+        # Identical CLI output means identical datasources, skip parsing and diffing
+        fingerprint = _result_fingerprint(datasources_result['result'])
+        memo_key = (host['host'], host['port'], 'datasources')
+        if _reuse_previous(status, previous_status, memo_key, fingerprint, 'datasources', 'datasources_changed_at'):
+            return
+        
+        # Parse datasources
+        datasources = parse_datasources(datasources_result['result'])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Parsed %s datasources", len(datasources))
+        
+        # Equal signatures mean no status change; only diff item by item for the log otherwise
+        signature = status_signature(datasources)
+        if _signature_unchanged(previous_status, memo_key, 'datasources', signature):
+            if 'datasources_changed_at' in previous_status:
+                status['datasources_changed_at'] = previous_status['datasources_changed_at']
+        elif _status_changed((previous_status or {}).get('datasources', []), datasources, 'Datasource'):
+            logger.info("Datasource status change detected for host %s:%s", host['host'], host['port'])
+            status['status_changed'] = True
+            status['datasources_changed_at'] = cycle_ts
+        
+        status['datasources'] = datasources
+        _RESULT_MEMO[memo_key] = (fingerprint, signature, datasources)
+
+def _apply_deployments(status, host, deployments_result, previous_status, cycle_ts):
+    """Parse a deployment CLI result into the host status"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Deployment check result success: %s", deployments_result['success'])
+    
+    if deployments_result['success'] and 'result' in deployments_result:
+        # Identical CLI output means identical deployments, skip parsing and diffing
+        fingerprint = _result_fingerprint(deployments_result['result'])
+        memo_key = (host['host'], host['port'], 'deployments')
+        if _reuse_previous(status, previous_status, memo_key, fingerprint, 'deployments', 'deployments_changed_at'):
+            return
+        
+        # Parse deployments
+        deployments = parse_deployments(deployments_result['result'])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Parsed %s deployments", len(deployments))
+        
+        # Equal signatures mean no status change; only diff item by item for the log otherwise
+        signature = status_signature(deployments)
+        if _signature_unchanged(previous_status, memo_key, 'deployments', signature):
+            if 'deployments_changed_at' in previous_status:
+                status['deployments_changed_at'] = previous_status['deployments_changed_at']
+        elif _status_changed((previous_status or {}).get('deployments', []), deployments, 'Deployment'):
+            logger.info("Deployment status change detected for host %s:%s", host['host'], host['port'])
+            status['status_changed'] = True
+            status['deployments_changed_at'] = cycle_ts
+        
+        status['deployments'] = deployments
+        _RESULT_MEMO[memo_key] = (fingerprint, signature, deployments)
+
+def _apply_worker_error(status, host, e):
+    """Mark a host status as failed; call from inside the except block so the traceback is logged"""
+    logger.exception("Error in monitor_host_worker for %s:%s: %s", host['host'], host['port'], e)
+    status['instance_status'] = 'error'
+    status['error'] = str(e)
+    status['status_changed'] = True  # Consider errors as status changes
+    return status
+
+def monitor_host_worker(host, username, password, previous_status=None, cycle_ts=None):
+    """
+    Worker function to monitor a single host and return its status (without saving to file)
+
+    previous_status is the host's last stored status; unchanged CLI results
+    reuse its parsed datasources/deployments instead of parsing again.
+    cycle_ts is the timestamp of the check, taken once by the caller and
+    used for every timestamp in the result.
+    """
+    host_id = host['id']
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Starting monitoring for host: %s:%s", host['host'], host['port'])
     
+    # Initialize status for this host
+    cycle_ts = cycle_ts or datetime.now().isoformat()
+    status = _new_host_status(cycle_ts)
+    
+    started = time.time()
+    _record_start()
     try:
-        # Create CLI executor
-        cli = JBossCliExecutor(
-            host=host['host'],
-            port=host['port'],
-            username=username,
-            password=password
-        )
+        # Reuse the host's CLI executor from previous cycles
+        cli = _get_or_create_cli(host_id, host, username, password)
+        
+        # One batched CLI call for all three checks, individual calls if that fails
+        batch = cli.run_batch(JBossCliExecutor.HOST_CHECK_COMMANDS)
         
         # Check server status
-        server_result = cli.check_server_status()
-        logger.info(f"Server status result: {server_result}")
+        server_result = batch[0] if batch else cli.check_server_status()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Server status result: %r", server_result)
         
         if not server_result['success']:
-            logger.warning(f"Server check failed for {host['host']}:{host['port']}")
+            logger.warning("Server check failed for %s:%s", host['host'], host['port'])
             status['instance_status'] = 'down'
             return status
         
@@ -115,75 +386,136 @@ def monitor_host_worker(host, username, password):
         status['instance_status'] = 'up'
         
         # Get datasources
-        datasources_result = cli.get_datasources()
-        logger.info(f"Datasource check result success: {datasources_result['success']}")
-        
-        if datasources_result['success'] and 'result' in datasources_result:
-            # Parse datasources
-            datasources = parse_datasources(datasources_result['result'])
-            logger.info(f"Parsed {len(datasources)} datasources")
-            
-            # Check for datasource status changes
-            old_datasources = status.get('datasources', [])
-            if _datasource_status_changed(old_datasources, datasources):
-                logger.info(f"Datasource status change detected for host {host['host']}:{host['port']}")
-                status['status_changed'] = True
-                status['datasources_changed_at'] = datetime.now().isoformat()
-            
-            status['datasources'] = datasources
+        _apply_datasources(status, host, batch[1] if batch else cli.get_datasources(), previous_status, cycle_ts)
         
         # Get deployments
-        deployments_result = cli.get_deployments()
-        logger.info(f"Deployment check result success: {deployments_result['success']}")
+        _apply_deployments(status, host, batch[2] if batch else cli.get_deployments(), previous_status, cycle_ts)
         
-        if deployments_result['success'] and 'result' in deployments_result:
-            # Parse deployments
-            deployments = parse_deployments(deployments_result['result'])
-            logger.info(f"Parsed {len(deployments)} deployments")
-            
-            # Check for deployment status changes
-            old_deployments = status.get('deployments', [])
-            if _deployment_status_changed(old_deployments, deployments):
-                logger.info(f"Deployment status change detected for host {host['host']}:{host['port']}")
-                status['status_changed'] = True
-                status['deployments_changed_at'] = datetime.now().isoformat()
-            
-            status['deployments'] = deployments
-        
-        # Update last check timestamp
-        status['last_check'] = datetime.now().isoformat()
-        
-        logger.info(f"Completed monitoring for host: {host['host']}:{host['port']}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Completed monitoring for host: %s:%s", host['host'], host['port'])
         return status
     except Exception as e:
-        logger.error(f"Error in monitor_host_worker for {host['host']}:{host['port']}: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        status['instance_status'] = 'error'
-        status['error'] = str(e)
-        status['status_changed'] = True  # Consider errors as status changes
-        return status
+        _discard_cli(host_id)
+        return _apply_worker_error(status, host, e)
+    finally:
+        _record_finish(started)
+
+async def monitor_host_worker_async(host, username, password, semaphore, previous_status, cycle_ts):
+    """Coroutine version of monitor_host_worker used by the background monitor"""
+    async with semaphore:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting monitoring for host: %s:%s", host['host'], host['port'])
+        status = _new_host_status(cycle_ts)
+        
+        started = time.time()
+        _record_start()
+        try:
+            cli = _get_or_create_cli(host['id'], host, username, password)
+            
+            batch = await cli.run_batch_async(JBossCliExecutor.HOST_CHECK_COMMANDS)
+            server_result = batch[0] if batch else await cli.check_server_status_async()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Server status result: %r", server_result)
+            
+            if not server_result['success']:
+                logger.warning("Server check failed for %s:%s", host['host'], host['port'])
+                status['instance_status'] = 'down'
+                return status
+            
+            status['instance_status'] = 'up'
+            _apply_datasources(status, host, batch[1] if batch else await cli.get_datasources_async(), previous_status, cycle_ts)
+            _apply_deployments(status, host, batch[2] if batch else await cli.get_deployments_async(), previous_status, cycle_ts)
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Completed monitoring for host: %s:%s", host['host'], host['port'])
+            return status
+        except Exception as e:
+            _discard_cli(host['id'])
+            return _apply_worker_error(status, host, e)
+        finally:
+            _record_finish(started)
+
+async def _gather_hosts(hosts, username, password, max_workers, current_status, cycle_ts, deadline):
+    """
+    Poll all hosts concurrently, at most max_workers at a time
+
+    Hosts still running at the deadline are cancelled and come back as
+    TimeoutError, so one hung instance can't stretch the cycle.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    
+    async def check(host):
+        worker = monitor_host_worker_async(host, username, password, semaphore, current_status.get(host['id']), cycle_ts)
+        return await asyncio.wait_for(worker, timeout=max(0, deadline - time.time()))
+    
+    return await asyncio.gather(*[check(host) for host in hosts], return_exceptions=True)
+
+def _load_credentials():
+    return MappingProxyType({environment: tuple(get_jboss_credentials(environment)) for environment in _ENVIRONMENTS})
+
+def _request_credentials_reload(signum, frame):
+    """SIGHUP handler; only sets a flag, the worker reloads at the start of its next cycle"""
+    _RELOAD_REQUESTED.set()
+
+def reload_credentials():
+    """Re-read JBoss credentials from the environment and .env file without restarting"""
+    global _CREDS
+    load_dotenv(override=True)
+    Config.PROD_JBOSS_USERNAME = os.environ.get('PROD_JBOSS_USERNAME')
+    Config.PROD_JBOSS_PASSWORD = os.environ.get('PROD_JBOSS_PASSWORD')
+    Config.NONPROD_JBOSS_USERNAME = os.environ.get('NONPROD_JBOSS_USERNAME')
+    Config.NONPROD_JBOSS_PASSWORD = os.environ.get('NONPROD_JBOSS_PASSWORD')
+    load_jboss_credentials()
+    # Swapped in one assignment, so a running cycle sees either the old or the new set
+    _CREDS = _load_credentials()
+    logger.info("JBoss credentials reloaded")
 
 def monitor_environment(environment):
-    """Monitor all hosts in an environment with true parallelism"""
-    logger.info(f"Starting monitoring for {environment} environment")
+    """Monitor all hosts in an environment from a blocking caller"""
+    return asyncio.run(monitor_environment_async(environment))
+
+async def monitor_environment_async(environment):
+    """
+    Monitor all hosts in an environment concurrently on the event loop
+
+    Returns a read-only view of the environment status after the cycle, or
+    None when nothing was polled.
+    """
+    logger.info("Starting monitoring for %s environment", environment)
     
-    # Get system credentials
-    username, password = get_jboss_credentials(environment)
+    # Credentials are pinned at worker start; direct callers outside the worker fetch them here
+    credentials = _CREDS.get(environment)
+    username, password = credentials if credentials is not None else get_jboss_credentials(environment)
     if not username or not password:
-        logger.warning(f"No system credentials found for {environment} environment")
+        logger.warning("No system credentials found for %s environment", environment)
         return
     
-    # Get all hosts
-    hosts = load_hosts(environment)
+    # File I/O runs off the event loop so it never stalls the other environment's polling
+    hosts = await asyncio.to_thread(load_hosts, environment)
     if not hosts:
-        logger.info(f"No hosts found for {environment} environment")
+        logger.info("No hosts found for %s environment", environment)
         return
     
-    logger.info(f"Found {len(hosts)} hosts for {environment} environment")
+    logger.info("Found %s hosts for %s environment", len(hosts), environment)
     
-    # Load current status to avoid race conditions with multiple threads updating the same file
-    current_status = load_status(environment)
+    # Only poll hosts that are due; stable hosts are checked less often
+    schedule = _host_schedule.setdefault(environment, {})
+    host_ids = {host['id'] for host in hosts}
+    for host_id in list(schedule):
+        if host_id not in host_ids:
+            del schedule[host_id]
+            _discard_cli(host_id)
+    
+    now = time.time()
+    due_hosts = [host for host in hosts if now >= schedule.get(host['id'], {}).get('next_due', 0)]
+    if len(due_hosts) < len(hosts):
+        logger.info("Skipping %s stable hosts in %s environment this cycle", len(hosts) - len(due_hosts), environment)
+    if not due_hosts:
+        return
+    hosts = due_hosts
+    
+    # Load current status; reuses last cycle's dict unless another writer touched the file
+    current_status = await asyncio.to_thread(_load_status_cached, environment)
     
     # Create a dict to hold all individual host statuses
     host_statuses = {}
@@ -191,137 +523,215 @@ def monitor_environment(environment):
     # Track if any status changed during this monitoring run
     status_changed = False
     
-    # Calculate effective max workers based on config
-    max_workers = Config.MAX_WORKERS
-    if hasattr(Config, 'MAX_CONCURRENT_HOSTS') and Config.MAX_CONCURRENT_HOSTS > 0:
-        max_workers = min(max_workers, Config.MAX_CONCURRENT_HOSTS)
+    # Track if anything at all differs from the stored status, and which hosts
+    persist_needed = False
+    dirty_ids = set()
+    
+    # Worker count adapts to measured host latency between cycles
+    max_workers = current_max_workers()
     
     start_time = time.time()
     
-    # Use ThreadPoolExecutor for parallel monitoring
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Create a dict mapping futures to their host IDs
-        future_to_host = {
-            executor.submit(monitor_host_worker, host, username, password): host['id']
-            for host in hosts
-        }
+    # One timestamp for every event in this cycle
+    cycle_ts = datetime.now().isoformat()
+    
+    # CLI calls are awaited as subprocesses, so one coroutine per host is enough
+    deadline = start_time + Config.MONITORING_INTERVAL * 0.8
+    results = await _gather_hosts(hosts, username, password, max_workers, current_status, cycle_ts, deadline)
+    
+    for host, host_status in zip(hosts, results):
+        host_id = host['id']
+        if isinstance(host_status, asyncio.TimeoutError):
+            logger.warning("Host %s:%s did not finish before the cycle deadline", host['host'], host['port'])
+            host_statuses[host_id] = {
+                'instance_status': 'timeout',
+                'datasources': [],
+                'deployments': [],
+                'last_check': cycle_ts,
+                'error': 'Host check did not finish within the monitoring cycle',
+                'status_changed': True
+            }
+            status_changed = True
+            persist_needed = True
+            dirty_ids.add(host_id)
+            _schedule_next_check(schedule, host_id, True, time.time())
+            continue
+        if isinstance(host_status, BaseException):
+            logger.error("Error monitoring host %s: %s", host_id, host_status)
+            # Still add failed hosts to the status with error state
+            host_statuses[host_id] = {
+                'instance_status': 'error',
+                'datasources': [],
+                'deployments': [],
+                'last_check': cycle_ts,
+                'error': str(host_status),
+                'status_changed': True  # Consider errors as status changes
+            }
+            status_changed = True
+            persist_needed = True
+            dirty_ids.add(host_id)
+            _schedule_next_check(schedule, host_id, True, time.time())
+            continue
         
-        # Process results as they complete
-        for future in as_completed(future_to_host):
-            host_id = future_to_host[future]
-            try:
-                # Get the result (host status) from the completed future
-                host_status = future.result()
-                
-                if host_status:
-                    # Check if previous status exists
-                    previous_status = current_status.get(host_id, {})
-                    
-                    # Check if overall instance status changed
-                    prev_instance_status = previous_status.get('instance_status')
-                    if prev_instance_status and _instance_status_changed(prev_instance_status, host_status['instance_status']):
-                        logger.info(f"Instance status changed for host {host_id} from {prev_instance_status} to {host_status['instance_status']}")
-                        host_status['status_changed'] = True
-                    
-                    # If any host status changed, mark the overall status as changed
-                    if host_status.get('status_changed', False):
-                        status_changed = True
-                    
-                    # Store the host status
-                    host_statuses[host_id] = host_status
-                    logger.info(f"Successfully processed host ID: {host_id}")
-            except Exception as e:
-                logger.error(f"Error monitoring host {host_id}: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
-                # Still add failed hosts to the status with error state
-                host_statuses[host_id] = {
-                    'instance_status': 'error',
-                    'datasources': [],
-                    'deployments': [],
-                    'last_check': datetime.now().isoformat(),
-                    'error': str(e),
-                    'status_changed': True  # Consider errors as status changes
-                }
+        if host_status:
+            # Check if previous status exists
+            previous_status = current_status.get(host_id, {})
+            result_changed = _host_result_changed(previous_status, host_status)
+            if result_changed:
+                persist_needed = True
+                dirty_ids.add(host_id)
+            _schedule_next_check(schedule, host_id, result_changed, time.time())
+            
+            # Check if overall instance status changed
+            prev_instance_status = previous_status.get('instance_status')
+            if prev_instance_status and _instance_status_changed(prev_instance_status, host_status['instance_status']):
+                logger.info("Instance status changed for host %s from %s to %s", host_id, prev_instance_status, host_status['instance_status'])
+                host_status['status_changed'] = True
+            
+            # If any host status changed, mark the overall status as changed
+            if host_status.get('status_changed', False):
                 status_changed = True
+            
+            # Store the host status
+            host_statuses[host_id] = host_status
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully processed host ID: %s", host_id)
     
-    # Update the status file with all the individual host statuses
-    if host_statuses:
+    # Drop entries for hosts that are no longer configured so the file tracks live hosts only
+    stale_ids = [key for key in current_status if not key.startswith('_') and key not in host_ids]
+    for key in stale_ids:
+        del current_status[key]
+    if stale_ids:
+        logger.info("Removed %s stale host entries from %s status", len(stale_ids), environment)
+        persist_needed = True
+    
+    # Only rewrite the status file when something changed, or as a periodic heartbeat
+    now = time.time()
+    heartbeat_due = now - _last_persist.get(environment, 0) > Config.PERSIST_HEARTBEAT_SEC
+    if host_statuses and not (status_changed or persist_needed or heartbeat_due):
+        logger.debug("No status changes in %s environment, skipping status file write", environment)
+    elif host_statuses:
         # Add global timestamp for this monitoring run
-        current_status['_last_check'] = datetime.now().isoformat()
+        current_status['_last_check'] = cycle_ts
         
         # If any status changed, add a change timestamp to force ETag updates
         if status_changed:
-            current_status['_status_changed_at'] = datetime.now().isoformat()
-            logger.info(f"Status changed detected in {environment} environment")
+            current_status['_status_changed_at'] = cycle_ts
+            logger.info("Status changed detected in %s environment", environment)
         
         # Merge with current status to update only changed hosts
         for host_id, status in host_statuses.items():
             current_status[host_id] = status
         
-        # Save the combined status
-        save_status(current_status, environment)
+        # Save the combined status; only changed hosts are re-serialized, except on
+        # the heartbeat which refreshes every shard's last_check. Updates logged for
+        # hosts not checked this cycle are kept either way. The save waits on the
+        # status file lock and fsyncs, so it runs in a thread.
+        await asyncio.to_thread(save_status, current_status, environment,
+                                dirty=None if heartbeat_due else dirty_ids, fresh=set(host_statuses))
+        _last_persist[environment] = now
+        
+        # The dict we just wrote is the file's content, no need to parse it next cycle
+        _STATUS_CACHE[environment] = (status_mtime(environment), current_status)
     
     elapsed = time.time() - start_time
-    logger.info(f"Completed monitoring for {environment} environment in {elapsed:.2f} seconds. Processed {len(host_statuses)} hosts.")
+    logger.info("Completed monitoring for %s environment in %.2f seconds. Processed %s hosts.", environment, elapsed, len(host_statuses))
+    
+    _cycle_host_counts[environment] = len(hosts)
+    
+    # Read-only view, callers must not grow the cycle's working dict
+    return MappingProxyType(current_status)
 
-def monitoring_worker():
+async def monitoring_worker():
     """Background worker that continuously monitors all environments with better error handling"""
     logger.info("Monitoring worker started")
     
+    # Cycles start on a fixed grid of monotonic deadlines so sleep jitter doesn't accumulate
+    next_deadline = None
+    
     while True:
         try:
             start_time = time.time()
+            if next_deadline is None:
+                next_deadline = time.monotonic()
+            if _RELOAD_REQUESTED.is_set():
+                _RELOAD_REQUESTED.clear()
+                await asyncio.to_thread(reload_credentials)
             logger.info("Starting monitoring cycle")
             
-            # Monitor production environment
-            try:
-                monitor_environment('production')
-            except Exception as e:
-                logger.error(f"Error monitoring production environment: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
+            # Environments share no state within a cycle, so monitor them concurrently
+            environments = _ENVIRONMENTS
+            results = await asyncio.gather(
+                *[monitor_environment_async(environment) for environment in environments],
+                return_exceptions=True
+            )
+            for environment, result in zip(environments, results):
+                if isinstance(result, Exception):
+                    logger.error("Error monitoring %s environment: %s", environment, result, exc_info=result)
             
-            # Monitor non-production environment
-            try:
-                monitor_environment('non_production')
-            except Exception as e:
-                logger.error(f"Error monitoring non-production environment: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
+            # Size the pool once over every host polled this cycle, all environments together
+            _adapt_workers(sum(_cycle_host_counts.pop(environment, 0) for environment in environments))
             
             # Calculate elapsed time
             elapsed = time.time() - start_time
-            logger.info(f"Monitoring cycle completed in {elapsed:.2f} seconds")
+            logger.info("Monitoring cycle completed in %.2f seconds", elapsed)
             
-            # Calculate wait time (ensure we don't wait negative time)
             # Use shorter interval if we're in development mode
             monitoring_interval = int(os.environ.get('MONITORING_INTERVAL') or Config.MONITORING_INTERVAL)
             # Cap minimum interval at 5 seconds to prevent excessive polling
-            wait_time = max(5, monitoring_interval - elapsed)
-            logger.info(f"Waiting {wait_time:.2f} seconds for next cycle")
+            monitoring_interval = max(5, monitoring_interval)
+            
+            next_deadline += monitoring_interval
+            now = time.monotonic()
+            wait_time = max(0, next_deadline - now)
+            if wait_time == 0:
+                behind = now - next_deadline
+                logger.warning("Monitoring cycle overran the %s second interval by %.2f seconds; "
+                               "consider raising MONITORING_INTERVAL or MAX_WORKERS", monitoring_interval, behind)
+                # Too far behind to catch up: drop the missed slots and restart the grid from now
+                if behind > Config.MAX_ACCUMULATED_POLL_SECONDS:
+                    next_deadline = now
+            logger.info("Waiting %.2f seconds for next cycle", wait_time)
             
             # Wait for next monitoring cycle
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
         
         except Exception as e:
-            logger.error(f"Error in monitoring worker: {str(e)}")
-            # Add stack trace for debugging
-            import traceback
-            logger.error(traceback.format_exc())
-            time.sleep(10)  # Wait a bit before retrying
+            logger.exception("Error in monitoring worker: %s", e)
+            next_deadline = None
+            await asyncio.sleep(10)  # Wait a bit before retrying
 
 def start_monitoring_worker():
-    """Start the background monitoring worker"""
+    """Start the background monitoring worker; safe to call more than once"""
+    global _WORKER_THREAD
+    
+    # Under the Flask debug reloader only the child process (WERKZEUG_RUN_MAIN=true) serves requests
+    if Config.DEBUG and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        logger.info("Skipping monitoring worker in the reloader parent process")
+        return
+    
+    with _worker_lock:
+        if _WORKER_THREAD is not None and _WORKER_THREAD.is_alive():
+            logger.info("Monitoring worker already running")
+            return
+        _WORKER_THREAD = _start_monitoring_thread()
+
+def _start_monitoring_thread():
+    global _CREDS
     logger.info("Starting background monitoring worker")
     
     # Create required directories
     os.makedirs(Config.PROD_ENV_PATH, exist_ok=True)
     os.makedirs(Config.NONPROD_ENV_PATH, exist_ok=True)
     
-    # Check system credentials
-    prod_username, prod_password = get_jboss_credentials('production')
-    nonprod_username, nonprod_password = get_jboss_credentials('non_production')
+    # Fetch system credentials once for the worker's lifetime
+    _CREDS = _load_credentials()
+    prod_username, prod_password = _CREDS['production']
+    nonprod_username, nonprod_password = _CREDS['non_production']
+    
+    # Signal handlers can only be installed from the main thread
+    if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGHUP, _request_credentials_reload)
     
     # Log warning if credentials are missing
     if not prod_username or not prod_password:
@@ -330,18 +740,17 @@ def start_monitoring_worker():
     if not nonprod_username or not nonprod_password:
         logger.warning("Non-Production JBoss CLI credentials are not set in environment variables")
     
-    # Start monitoring in a separate thread to avoid blocking app startup
+    # Run the event loop in a separate thread to avoid blocking app startup
     def run_monitoring():
         try:
             logger.info("Running monitoring worker in background thread")
-            monitoring_worker()
+            asyncio.run(monitoring_worker())
         except Exception as e:
-            logger.error(f"Fatal error in monitoring worker thread: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Fatal error in monitoring worker thread: %s", e)
     
     # Create and start the thread
     monitoring_thread = threading.Thread(target=run_monitoring)
     monitoring_thread.daemon = True  # Make thread a daemon so it exits when main thread exits
     monitoring_thread.start()
     logger.info("Monitoring worker thread started")
+    return monitoring_thread
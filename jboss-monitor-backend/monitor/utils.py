@@ -1,90 +1,435 @@
 # monitor/utils.py
 import os
 import json
+import mmap
+import time
+import hashlib
+import queue
+import atexit
 import logging
-import traceback
+import tempfile
+import threading
 import filelock
 from datetime import datetime
 from config import Config
 from hosts.routes import get_environment_path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Host updates waiting for the background writer: (environment, host_id, entry, meta)
+_status_queue = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+_WRITER_BATCH_WINDOW = 0.2  # seconds to keep collecting updates after the first one arrives
+
+# Digest of the last saved status (without _last_updated) and the status mtime right after that save
+_LAST_SAVE = {}
+
+# Files smaller than this are read normally, mapping them costs more than the copy it saves
+_MMAP_MIN_SIZE = 64 * 1024
+
+def get_status_dir(environment):
+    """Directory holding one status shard per host plus the metadata index"""
+    return os.path.join(get_environment_path(environment), 'status')
+
 def get_status_file(environment):
-    """Get the status file path for the specified environment"""
+    """Get the status index path, which holds the environment-wide metadata"""
+    return os.path.join(get_status_dir(environment), '_index.json')
+
+def _legacy_status_file(environment):
+    """Single-file status layout used before per-host shards"""
     return os.path.join(get_environment_path(environment), 'status.json')
 
-def load_status(environment):
-    """Load status from file storage with enhanced error handling"""
-    status_file = get_status_file(environment)
-    if os.path.exists(status_file):
+def _shard_path(status_dir, host_id):
+    return os.path.join(status_dir, f"{host_id}.json")
+
+def _list_shards(status_dir):
+    """Map of host_id -> shard path for every host shard in the status directory"""
+    shards = {}
+    try:
+        with os.scandir(status_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                # Skip the index and in-flight temp files
+                if name.endswith('.json') and not name.startswith(('_', '.')):
+                    shards[name[:-5]] = entry.path
+    except FileNotFoundError:
+        pass
+    return shards
+
+def _wal_file(environment):
+    """Append-only log of single-host updates not yet folded into the shards"""
+    return os.path.join(get_environment_path(environment), 'status.wal')
+
+def status_mtime(environment):
+    """
+    Latest modification time (ns) of the status directory or WAL, or None if neither exists
+
+    Every shard or index write renames a file into the directory, which bumps
+    the directory's own mtime, so one stat covers all hosts.
+    """
+    mtimes = []
+    for path in (get_status_dir(environment), _wal_file(environment)):
         try:
-            with open(status_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            # Handle corrupted JSON file
-            logger.error(f"Error loading status file for {environment}: {str(e)}")
-            # Create backup of corrupted file
-            backup_file = status_file + ".corrupted"
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return max(mtimes) if mtimes else None
+
+def _read_json(path):
+    """Read a JSON file, returning None if it is missing or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+                # Parse straight out of the page cache instead of copying the file into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            data = f.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        logger.error(f"Error reading status file {path}: {str(e)}")
+        return None
+
+def _load_legacy_status(environment):
+    """Load status from the old single status.json"""
+    # Saves replace files atomically, so an unreadable file is not repaired here, just skipped
+    return _read_json(_legacy_status_file(environment)) or {}
+
+def load_status(environment, host_ids=None):
+    """
+    Load status from the per-host shards as one flat dict
+
+    Metadata keys come from the index. When host_ids is given only those
+    shards are read. Falls back to the legacy status.json until the first
+    sharded save.
+    """
+    status_dir = get_status_dir(environment)
+    if not os.path.isdir(status_dir):
+        status = _load_legacy_status(environment)
+    else:
+        index = _read_json(get_status_file(environment)) or {}
+        status = dict(index.get('meta', {}))
+        shards = _list_shards(status_dir)
+        if host_ids is not None:
+            shards = {host_id: shards[host_id] for host_id in host_ids if host_id in shards}
+        
+        for host_id, path in shards.items():
+            shard = _read_json(path)
+            if shard is not None:
+                status[host_id] = shard
+    
+    # Replay updates logged since the last checkpoint, oldest first
+    wanted_ids = set(host_ids) if host_ids is not None else None
+    for delta in _read_wal(environment):
+        for key, value in delta.items():
+            if key.startswith('_'):
+                status[key] = value
+            elif wanted_ids is not None and key not in wanted_ids:
+                continue
+            elif value is None:
+                status.pop(key, None)
+            else:
+                status[key] = value
+    return status
+
+def _read_wal_lines(path):
+    try:
+        with open(path, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    deltas = []
+    for line in lines:
+        try:
+            deltas.append(orjson.loads(line) if orjson is not None else json.loads(line))
+        except ValueError:
+            # A torn last line from a crash mid-append; everything before it is intact
+            logger.warning(f"Skipping unreadable line in {path}")
+    return deltas
+
+def _read_wal(environment):
+    """Deltas from an interrupted checkpoint followed by the live WAL, in append order"""
+    wal_file = _wal_file(environment)
+    return _read_wal_lines(wal_file + '.ckpt') + _read_wal_lines(wal_file)
+
+def append_status_delta(host_id, entry, environment, meta=None):
+    """
+    Record a single host update by appending one line to the status WAL
+
+    Cheaper than save_status for one host: no lock and no shard rewrite.
+    entry=None clears the host. The WAL is folded into the shards by the
+    next save_status, or once it grows past STATUS_WAL_CHECKPOINT_BYTES.
+    """
+    delta = dict(meta or {})
+    delta[host_id] = entry
+    _append_delta(delta, environment)
+
+def _append_delta(delta, environment):
+    delta['_last_updated'] = datetime.now().isoformat()
+    
+    # One write() on an O_APPEND descriptor, so concurrent appenders never interleave a line
+    fd = os.open(_wal_file(environment), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, _dump_status(delta))
+        wal_size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+    
+    if wal_size >= Config.STATUS_WAL_CHECKPOINT_BYTES:
+        checkpoint_status(environment)
+
+def _status_writer():
+    """Drain queued host updates and write each batch as one WAL line per environment"""
+    while True:
+        batch = [_status_queue.get()]
+        deadline = time.monotonic() + _WRITER_BATCH_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_status_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Later updates for the same host replace earlier ones
+        merged = {}
+        for environment, host_id, entry, meta in batch:
+            delta = merged.setdefault(environment, {})
+            if meta:
+                delta.update(meta)
+            delta[host_id] = entry
+        
+        for environment, delta in merged.items():
             try:
-                import shutil
-                shutil.copy2(status_file, backup_file)
-                logger.info(f"Created backup of corrupted file at {backup_file}")
-                # Create empty status file
-                with open(status_file, 'w') as f:
-                    json.dump({}, f)
-                logger.info(f"Created new empty status file for {environment}")
-                return {}
-            except Exception as e2:
-                logger.error(f"Error handling corrupted status file: {str(e2)}")
-                return {}
-    return {}
-
-def save_status(status, environment):
-    """Save status to file storage with improved thread safety"""
-    status_file = get_status_file(environment)
-    os.makedirs(os.path.dirname(status_file), exist_ok=True)
+                _append_delta(delta, environment)
+            except Exception as e:
+                logger.exception("Error writing queued status updates for %s: %s", environment, e)
+        
+        for _ in batch:
+            _status_queue.task_done()
+
+def enqueue_status(environment, host_id, entry, meta=None):
+    """
+    Queue a host update for the background writer
+
+    Updates arriving close together are coalesced into a single WAL append.
+    Call flush_status_sync() before reading the status back.
+    """
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_status_writer, name="status-writer", daemon=True)
+                _writer_thread.start()
+    _status_queue.put((environment, host_id, entry, meta))
+
+def flush_status_sync():
+    """Block until every queued status update has been written"""
+    _status_queue.join()
+
+atexit.register(flush_status_sync)
+
+def _fold_wal(status, environment, dirty, fresh=None):
+    """
+    Move the WAL aside and apply its deltas to a status about to be saved
+
+    Hosts the caller is writing (dirty) keep the caller's version; other
+    logged hosts are newer than their shards and are added to dirty.
+    dirty=None rewrites every shard: hosts in fresh keep the caller's
+    version and logged updates to all other hosts are applied first.
+    """
+    wal_file = _wal_file(environment)
+    ckpt_file = wal_file + '.ckpt'
+    # A leftover .ckpt from an interrupted save is folded first; the live WAL waits for the next save
+    if not os.path.exists(ckpt_file):
+        try:
+            os.replace(wal_file, ckpt_file)
+        except FileNotFoundError:
+            return dirty
+    
+    deltas = _read_wal_lines(ckpt_file)
+    
+    # The caller's version wins for these; later deltas for other hosts replace earlier ones
+    keep = set(dirty if dirty is not None else fresh or ())
+    logged = set()
+    for delta in deltas:
+        for key, value in delta.items():
+            if key.startswith('_'):
+                status.setdefault(key, value)
+            elif key in keep:
+                continue
+            elif value is None:
+                status.pop(key, None)
+                logged.add(key)
+            else:
+                status[key] = value
+                logged.add(key)
+    return None if dirty is None else keep | logged
+
+def _persist_status(status, environment, dirty, fresh=None):
+    dirty = _fold_wal(status, environment, dirty, fresh)
+    _write_shards(status, environment, dirty)
+    try:
+        os.unlink(_wal_file(environment) + '.ckpt')
+    except FileNotFoundError:
+        pass
+
+def _dump_status(status):
+    """Serialize a status dict to bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(status, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(status) + '\n').encode()
+
+def _write_atomic(path, payload):
+    """Write to a temp file in the same directory and rename it over the target"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.status-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            # Make sure the data is on disk before the rename makes it visible
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_host_status(environment, host_id, entry):
+    """
+    Write one host's status shard
+
+    The shard is written to a temp file and renamed into place, so it needs
+    no lock: concurrent writers for different hosts never share a file.
+    """
+    status_dir = get_status_dir(environment)
+    os.makedirs(status_dir, exist_ok=True)
+    _write_atomic(_shard_path(status_dir, host_id), _dump_status(entry))
+
+def _write_shards(status, environment, dirty):
+    """Write changed host shards, drop shards for removed hosts, then rewrite the index"""
+    status_dir = get_status_dir(environment)
+    existing = _list_shards(status_dir)
+    
+    host_ids = [key for key in status if not key.startswith('_')]
+    for host_id in host_ids:
+        # New hosts always get a shard, known ones only when dirty
+        if dirty is None or host_id in dirty or host_id not in existing:
+            save_host_status(environment, host_id, status[host_id])
+    
+    # Remove shards for hosts no longer in the status
+    live_ids = set(host_ids)
+    for host_id, path in existing.items():
+        if host_id not in live_ids:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    
+    index = {'meta': {key: value for key, value in status.items() if key.startswith('_')}}
+    _write_atomic(get_status_file(environment), _dump_status(index))
+
+def save_status(status, environment, dirty=None, fresh=None):
+    """
+    Save status to the per-host shards with improved thread safety
+
+    Only hosts in dirty (and hosts without a shard yet) are re-serialized;
+    dirty=None rewrites every shard. Logged single-host updates are folded
+    in first, except for hosts in dirty, or in fresh when dirty is None,
+    whose version in status is newer. The small index is always rewritten.
+    A save identical to the previous one from this process is skipped, so
+    _last_updated and the ETag only move when something really changed.
+    """
+    status_dir = get_status_dir(environment)
+    os.makedirs(status_dir, exist_ok=True)
+    
+    # Nothing to do if the content matches our last save and nobody has written since
+    digest = hashlib.blake2b(_dump_status({k: v for k, v in status.items() if k != '_last_updated'}),
+                             digest_size=16).digest()
+    if _LAST_SAVE.get(environment) == (digest, status_mtime(environment)):
+        logger.debug("Status for %s unchanged, skipping write", environment)
+        return
     
     # Add last_updated timestamp to force ETag changes and help clients detect updates
     status['_last_updated'] = datetime.now().isoformat()
     
     # Use file lock to prevent race conditions
-    lock_file = status_file + ".lock"
+    lock_file = os.path.join(get_environment_path(environment), 'status.lock')
     lock = filelock.FileLock(lock_file, timeout=Config.STATUS_UPDATE_LOCK_TIMEOUT)
     
     try:
         with lock:
-            with open(status_file, 'w') as f:
-                json.dump(status, f, indent=2)
-            logger.debug(f"Status file updated for {environment}")
+            _persist_status(status, environment, dirty, fresh)
+            _LAST_SAVE[environment] = (digest, status_mtime(environment))
+            logger.debug("Status shards updated for %s", environment)
     except filelock.Timeout:
-        logger.error(f"Could not acquire lock for {status_file} within {Config.STATUS_UPDATE_LOCK_TIMEOUT} seconds")
-        # Still try to write the file as a fallback
-        with open(status_file, 'w') as f:
-            json.dump(status, f, indent=2)
-        logger.debug(f"Status file updated for {environment} (without lock)")
+        logger.error("Could not acquire lock for %s within %s seconds", lock_file, Config.STATUS_UPDATE_LOCK_TIMEOUT)
+        # Still try to write as a fallback; the renames keep readers from seeing partial files
+        _persist_status(status, environment, dirty, fresh)
+        logger.debug("Status shards updated for %s (without lock)", environment)
     except Exception as e:
-        logger.error(f"Error saving status file: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error saving status file: %s", e)
+
+def checkpoint_status(environment):
+    """Fold the status WAL into the shards and truncate it"""
+    status = load_status(environment)
+    save_status(status, environment, dirty=set())
+    logger.info(f"Checkpointed status WAL for {environment}")
+
+# (username, password) per environment, built from Config
+_CREDS_MAP = {}
+
+def load_jboss_credentials():
+    """(Re)build the credentials map from Config; call again after Config changes"""
+    global _CREDS_MAP
+    _CREDS_MAP = {
+        'production': (Config.PROD_JBOSS_USERNAME, Config.PROD_JBOSS_PASSWORD),
+        'non_production': (Config.NONPROD_JBOSS_USERNAME, Config.NONPROD_JBOSS_PASSWORD)
+    }
+    for environment, (username, password) in _CREDS_MAP.items():
+        logger.debug(f"{environment} credentials from env: Username='{username}', Password exists={password is not None}")
 
 def get_jboss_credentials(environment):
-    """Get JBoss credentials for the specified environment with debugging"""
-    # Try environment variables first
-    if environment == 'production':
-        username = Config.PROD_JBOSS_USERNAME
-        password = Config.PROD_JBOSS_PASSWORD
-        print(f"Production credentials from env: Username='{username}', Password exists={password is not None}")
-    elif environment == 'non_production':
-        username = Config.NONPROD_JBOSS_USERNAME
-        password = Config.NONPROD_JBOSS_PASSWORD
-        print(f"Non-Production credentials from env: Username='{username}', Password exists={password is not None}")
-    
-    return username, password
+    """Get JBoss credentials for the specified environment"""
+    return _CREDS_MAP.get(environment, (None, None))
+
+load_jboss_credentials()
+
+# (response key, type label) for each datasource flavour JBoss reports
+_DS_KEYS = (('data-source', 'data-source'), ('xa-data-source', 'xa-data-source'))
+
+def _datasources_from_dict(entries, label):
+    """Datasources from {'name': {...attributes}}, common in newer JBoss versions"""
+    datasources = []
+    append = datasources.append
+    for ds_name, ds_details in entries.items():
+        get = ds_details.get
+        # Connection status is only known when statistics are enabled, otherwise assume valid
+        connection_valid = not get('failed', False) if get('statistics-enabled', False) else True
+        append({
+            'name': ds_name,
+            'type': label,
+            'status': 'up' if get('enabled', False) and connection_valid else 'down',
+            'jndi-name': get('jndi-name', ''),
+            'driver': get('driver-name', '')
+        })
+    return datasources
+
+def _datasources_from_list(names, label):
+    """Datasources from a plain list of names, seen in some older JBoss versions"""
+    # Assume up since we can't determine the status from the list format
+    return [{'name': ds_name, 'type': label, 'status': 'up'} for ds_name in names]
 
 def parse_datasources(ds_data):
     """
@@ -94,80 +439,23 @@ def parse_datasources(ds_data):
     Returns a list of datasource dictionaries with name, type and status
     """
     datasources = []
-    logger.debug(f"Parsing datasources from data: {type(ds_data)}")
+    logger.debug("Parsing datasources from data: %s", type(ds_data))
     
     # If not a dictionary, we can't parse it
     if not isinstance(ds_data, dict):
-        logger.warning(f"Datasource data is not a dictionary: {type(ds_data)}")
+        logger.warning("Datasource data is not a dictionary: %s", type(ds_data))
         return datasources
     
     try:
-        # Format 1: {'data-source': {'name1': {...}, 'name2': {...}}, 'xa-data-source': {...}}
-        # Common in newer JBoss versions
-        if 'data-source' in ds_data and isinstance(ds_data['data-source'], dict):
-            for ds_name, ds_details in ds_data['data-source'].items():
-                logger.debug(f"Processing datasource: {ds_name}")
-                enabled = ds_details.get('enabled', False)
-                
-                # Get connection status if available
-                connection_valid = True  # Default to true if we can't determine
-                if 'statistics-enabled' in ds_details and ds_details.get('statistics-enabled', False):
-                    # If statistics are enabled, we might have more detailed status
-                    connection_valid = not ds_details.get('failed', False)
-                
-                datasources.append({
-                    'name': ds_name,
-                    'type': 'data-source',
-                    'status': 'up' if enabled and connection_valid else 'down',
-                    'jndi-name': ds_details.get('jndi-name', ''),
-                    'driver': ds_details.get('driver-name', '')
-                })
-        
-        # Format 2: {'data-source': ['name1', 'name2'], 'xa-data-source': ['name3']}
-        # Common in some older JBoss versions
-        elif 'data-source' in ds_data and isinstance(ds_data['data-source'], list):
-            for ds_name in ds_data['data-source']:
-                logger.debug(f"Processing datasource (list format): {ds_name}")
-                datasources.append({
-                    'name': ds_name,
-                    'type': 'data-source',
-                    'status': 'up'  # Assume up since we can't determine from list format
-                })
-        
-        # Handle XA datasources with dictionary format
-        if 'xa-data-source' in ds_data and isinstance(ds_data['xa-data-source'], dict):
-            for ds_name, ds_details in ds_data['xa-data-source'].items():
-                logger.debug(f"Processing XA datasource: {ds_name}")
-                enabled = ds_details.get('enabled', False)
-                
-                # Get connection status if available
-                connection_valid = True  # Default to true if we can't determine
-                if 'statistics-enabled' in ds_details and ds_details.get('statistics-enabled', False):
-                    # If statistics are enabled, we might have more detailed status
-                    connection_valid = not ds_details.get('failed', False)
-                
-                datasources.append({
-                    'name': ds_name,
-                    'type': 'xa-data-source',
-                    'status': 'up' if enabled and connection_valid else 'down',
-                    'jndi-name': ds_details.get('jndi-name', ''),
-                    'driver': ds_details.get('driver-name', '')
-                })
-        
-        # Handle XA datasources with list format
-        elif 'xa-data-source' in ds_data and isinstance(ds_data['xa-data-source'], list):
-            for ds_name in ds_data['xa-data-source']:
-                logger.debug(f"Processing XA datasource (list format): {ds_name}")
-                datasources.append({
-                    'name': ds_name,
-                    'type': 'xa-data-source',
-                    'status': 'up'  # Assume up since we can't determine from list format
-                })
-        
+        for key, label in _DS_KEYS:
+            entries = ds_data.get(key)
+            if isinstance(entries, dict):
+                datasources.extend(_datasources_from_dict(entries, label))
+            elif isinstance(entries, list):
+                datasources.extend(_datasources_from_list(entries, label))
         return datasources
     except Exception as e:
-        logger.error(f"Error parsing datasources: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Error parsing datasources: %s", e)
         return []
 
 def parse_deployments(deployment_data):
@@ -179,7 +467,7 @@ def parse_deployments(deployment_data):
     Returns a list of deployment dictionaries with name and status
     """
     deployments = []
-    logger.debug(f"Parsing deployments from data: {type(deployment_data)}")
+    logger.debug("Parsing deployments from data: %s", type(deployment_data))
     
     try:
         # Format 1: Dictionary with deployment names as keys
@@ -187,7 +475,7 @@ def parse_deployments(deployment_data):
         if isinstance(deployment_data, dict):
             for deployment_name, deployment_details in deployment_data.items():
                 if isinstance(deployment_details, dict):
-                    logger.debug(f"Processing deployment: {deployment_name}")
+                    logger.debug("Processing deployment: %s", deployment_name)
                     enabled = deployment_details.get('enabled', False)
                     
                     # Get runtime name if available
@@ -225,7 +513,7 @@ def parse_deployments(deployment_data):
                                 if '.' in deployment_name:
                                     deployment_type = deployment_name.split('.')[-1].lower()
                                 
-                                logger.debug(f"Processing deployment from address: {deployment_name}")
+                                logger.debug("Processing deployment from address: %s", deployment_name)
                                 deployments.append({
                                     'name': deployment_name,
                                     'type': deployment_type,
@@ -241,7 +529,7 @@ def parse_deployments(deployment_data):
                         if '.' in deployment_name:
                             deployment_type = deployment_name.split('.')[-1].lower()
                         
-                        logger.debug(f"Processing deployment with name attr: {deployment_name}")
+                        logger.debug("Processing deployment with name attr: %s", deployment_name)
                         deployments.append({
                             'name': deployment_name,
                             'type': deployment_type,
@@ -250,6 +538,14 @@ def parse_deployments(deployment_data):
         
         return deployments
     except Exception as e:
-        logger.error(f"Error parsing deployments: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Error parsing deployments: %s", e)
         return []
+
+def status_signature(items):
+    """
+    Canonical (name, status) tuple for parsed datasources or deployments
+
+    Two lists with equal signatures carry no status change, so callers can
+    compare signatures with a single == instead of diffing the lists.
+    """
+    return tuple(sorted((item['name'], item['status']) for item in items))
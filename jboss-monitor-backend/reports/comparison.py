@@ -2,6 +2,9 @@
 import os
 import json
 import logging
+import itertools
+import threading
+from functools import lru_cache
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, ListFlowable, ListItem
@@ -10,8 +13,89 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Paragraph and table styles never vary between comparisons, so build them once at import
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = _STYLES['Title']
+_HEADING_STYLE = _STYLES['Heading2']
+_H3_STYLE = _STYLES['Heading3']
+_NORMAL_STYLE = _STYLES['Normal']
+_ITALIC_STYLE = _STYLES['Italic']
+_CENTER_STYLE = ParagraphStyle('CenterStyle', parent=_NORMAL_STYLE, alignment=TA_CENTER)
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Base commands for the host status table; the two status cell colours are appended per host
+_STATUS_TABLE_CMDS = (
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+)
+
+# Header row and grid shared by the datasource and deployment change tables
+_CHANGE_TABLE_CMDS = (
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+)
+
+LEGEND_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
+    ('BACKGROUND', (0, 1), (0, 1), colors.lightpink),
+    ('BACKGROUND', (0, 2), (0, 2), colors.lightgrey),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Parsed reports index plus an id -> entry map, reused until the file's mtime or size changes
+_INDEX_CACHE = {'key': None, 'reports': None, 'by_id': None}
+_index_cache_lock = threading.Lock()
+
+def _load_index():
+    """Return (reports, by_id) for the reports index, or None if it doesn't exist"""
+    reports_index_file = os.path.join(Config.REPORTS_PATH, 'reports_index.json')
+    try:
+        st = os.stat(reports_index_file)
+    except FileNotFoundError:
+        return None
+    
+    key = (reports_index_file, st.st_mtime_ns, st.st_size)
+    with _index_cache_lock:
+        if _INDEX_CACHE['key'] == key:
+            return _INDEX_CACHE['reports'], _INDEX_CACHE['by_id']
+    
+    with open(reports_index_file, 'rb') as f:
+        data = f.read()
+    reports = orjson.loads(data) if orjson is not None else json.loads(data)
+    by_id = {r['id']: r for r in reports if 'id' in r}
+    with _index_cache_lock:
+        _INDEX_CACHE.update(key=key, reports=reports, by_id=by_id)
+    return reports, by_id
+
 def compare_reports(report1_id, report2_id):
     """
     Compare two reports and return the differences
@@ -25,18 +109,15 @@ def compare_reports(report1_id, report2_id):
     """
     try:
         # Load reports data
-        reports_dir = Config.REPORTS_PATH
-        reports_index_file = os.path.join(reports_dir, 'reports_index.json')
-        
-        if not os.path.exists(reports_index_file):
+        index = _load_index()
+        if index is None:
             return {"error": "Reports index not found"}
         
-        with open(reports_index_file, 'r') as f:
-            reports_index = json.load(f)
+        by_id = index[1]
         
         # Find report entries in the index
-        report1 = next((r for r in reports_index if r['id'] == report1_id), None)
-        report2 = next((r for r in reports_index if r['id'] == report2_id), None)
+        report1 = by_id.get(report1_id)
+        report2 = by_id.get(report2_id)
         
         if not report1 or not report2:
             return {"error": "One or both reports not found"}
@@ -49,7 +130,8 @@ def compare_reports(report1_id, report2_id):
         report1_data = extract_data_from_pdf(report1_id)
         report2_data = extract_data_from_pdf(report2_id)
         
-        # Compare the data
+        # Compare the data; the summary counts come from the same pass
+        host_changes, change_counts = compare_hosts(report1_data, report2_data)
         comparison_result = {
             "report1": {
                 "id": report1_id,
@@ -61,48 +143,74 @@ def compare_reports(report1_id, report2_id):
                 "created_at": report2.get('created_at'),
                 "environment": report2.get('environment')
             },
-            "hosts": compare_hosts(report1_data, report2_data),
+            "hosts": host_changes,
             "summary": {
                 "total_hosts": len(report1_data),
-                "status_changes": 0,
-                "datasource_changes": 0,
-                "deployment_changes": 0
+                **change_counts
             }
         }
         
-        # Update summary with counts
-        for host_comparison in comparison_result["hosts"]:
-            if host_comparison.get("status_changed"):
-                comparison_result["summary"]["status_changes"] += 1
-            
-            comparison_result["summary"]["datasource_changes"] += len(host_comparison.get("datasource_changes", []))
-            comparison_result["summary"]["deployment_changes"] += len(host_comparison.get("deployment_changes", []))
-        
         return comparison_result
         
     except Exception as e:
-        logger.error(f"Error comparing reports: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error comparing reports: %s", e)
         return {"error": str(e)}
 
+# Stand-in host for reports without a usable data file. Comparisons only read it,
+# so the nested status dict is shared; timestamps are left unset rather than faked
+_PLACEHOLDER_HOST = {
+    "host": "placeholder-host",
+    "port": 9990,
+    "instance": "placeholder-instance",
+    "id": "placeholder-id",
+    "added_by": "system",
+    "added_at": None,
+    "status": {
+        "instance_status": "unknown",
+        "datasources": (),
+        "deployments": (),
+        "last_check": None
+    }
+}
+
+@lru_cache(maxsize=32)
+def _read_data_file(path, mtime_ns, size):
+    """Parse a report data file; the mtime and size in the key drop stale entries on rewrite"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if path.endswith('.zst'):
+        content = zstandard.ZstdDecompressor().decompress(content)
+    content = content.strip()
+    if not content:
+        return None
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
 def extract_data_from_pdf(report_id):
     """
     Extract structured data from a report PDF for comparison purposes.
     Falls back to generated dummy data if no valid data file exists.
     """
-    # Look for a data file
+    # Look for a data file; compressed ones are only written when zstandard is installed
     reports_dir = Config.REPORTS_PATH
-    data_file = os.path.join(reports_dir, f"{report_id}.json")
+    names = (f"{report_id}.json.zst", f"{report_id}.json") if zstandard is not None else (f"{report_id}.json",)
+    
+    st = None
+    for name in names:
+        data_file = os.path.join(reports_dir, name)
+        try:
+            st = os.stat(data_file)
+            break
+        except OSError:
+            pass
     
-    if os.path.exists(data_file):
+    if st is not None:
         try:
-            with open(data_file, 'r') as f:
-                content = f.read().strip()
-                if content:  # Check if file is not empty
-                    return json.loads(content)
-                else:
-                    logger.warning(f"Data file for report {report_id} is empty")
+            data = _read_data_file(data_file, st.st_mtime_ns, st.st_size)
+            if data is not None:  # Check if file is not empty
+                # The cached list is shared, so hand out a copy
+                return list(data)
+            else:
+                logger.warning(f"Data file for report {report_id} is empty")
         except Exception as e:
             logger.error(f"Error reading data file for report {report_id}: {str(e)}")
     else:
@@ -115,35 +223,15 @@ def extract_data_from_pdf(report_id):
     # First, look up the report in the index to get its environment
     env = "unknown"
     try:
-        reports_index_file = os.path.join(reports_dir, 'reports_index.json')
-        if os.path.exists(reports_index_file):
-            with open(reports_index_file, 'r') as f:
-                reports = json.load(f)
-                for r in reports:
-                    if r.get('id') == report_id:
-                        env = r.get('environment', 'unknown')
-                        break
+        index = _load_index()
+        if index is not None:
+            env = index[1].get(report_id, {}).get('environment', 'unknown')
     except Exception as e:
         logger.error(f"Error loading reports index: {str(e)}")
     
     # Generate placeholder data
     logger.warning(f"Generating placeholder data for report {report_id} in environment {env}")
-    return [
-        {
-            "host": "placeholder-host",
-            "port": 9990,
-            "instance": "placeholder-instance",
-            "id": "placeholder-id",
-            "added_by": "system",
-            "added_at": datetime.now().isoformat(),
-            "status": {
-                "instance_status": "unknown",
-                "datasources": [],
-                "deployments": [],
-                "last_check": datetime.now().isoformat()
-            }
-        }
-    ]
+    return [dict(_PLACEHOLDER_HOST)]
 
 def compare_hosts(hosts1, hosts2):
     """
@@ -154,37 +242,24 @@ def compare_hosts(hosts1, hosts2):
         hosts2 (list): Host data from the second report
     
     Returns:
-        list: Comparison results for each host
+        tuple: Comparison results for each host, and a dict with the
+        status_changes, datasource_changes and deployment_changes counts
     """
     comparison_results = []
+    status_changes = 0
+    datasource_changes = 0
+    deployment_changes = 0
     
     # Create dictionaries for quick lookups
-    hosts1_dict = {h['host'] + ':' + str(h['port']): h for h in hosts1 if 'host' in h and 'port' in h}
-    hosts2_dict = {h['host'] + ':' + str(h['port']): h for h in hosts2 if 'host' in h and 'port' in h}
+    hosts1_dict = {(h['host'], str(h['port'])): h for h in hosts1 if 'host' in h and 'port' in h}
+    hosts2_dict = {(h['host'], str(h['port'])): h for h in hosts2 if 'host' in h and 'port' in h}
     
-    # Find all unique hosts across both reports
-    all_hosts = set(hosts1_dict.keys()) | set(hosts2_dict.keys())
-    
-    for host_key in all_hosts:
-        host1 = hosts1_dict.get(host_key)
+    # Hosts in the first report are either removed or compared; a single probe into the second decides
+    for host_key, host1 in hosts1_dict.items():
         host2 = hosts2_dict.get(host_key)
         
-        # Handle cases where a host exists in only one report
-        if not host1:
-            comparison_results.append({
-                "host": host2['host'],
-                "port": host2['port'],
-                "status": "added",
-                "instance": host2.get('instance', 'unknown'),
-                "instance_status": host2.get('status', {}).get('instance_status', 'unknown'),
-                "old_instance_status": None,
-                "status_changed": True,
-                "datasource_changes": [],
-                "deployment_changes": []
-            })
-            continue
-            
-        if not host2:
+        # Handle hosts that exist only in the first report
+        if host2 is None:
             comparison_results.append({
                 "host": host1['host'],
                 "port": host1['port'],
@@ -193,9 +268,11 @@ def compare_hosts(hosts1, hosts2):
                 "instance_status": None,
                 "old_instance_status": host1.get('status', {}).get('instance_status', 'unknown'),
                 "status_changed": True,
+                "has_changes": True,
                 "datasource_changes": [],
                 "deployment_changes": []
             })
+            status_changes += 1
             continue
         
         # Now we know both hosts exist, so we can compare them
@@ -215,22 +292,10 @@ def compare_hosts(hosts1, hosts2):
         ds1 = {ds['name']: ds for ds in host1.get('status', {}).get('datasources', []) if 'name' in ds}
         ds2 = {ds['name']: ds for ds in host2.get('status', {}).get('datasources', []) if 'name' in ds}
         
-        # Find all unique datasources
-        all_datasources = set(ds1.keys()) | set(ds2.keys())
-        
-        for ds_name in all_datasources:
-            datasource1 = ds1.get(ds_name)
+        for ds_name, datasource1 in ds1.items():
             datasource2 = ds2.get(ds_name)
             
-            if not datasource1:
-                host_result["datasource_changes"].append({
-                    "name": ds_name,
-                    "type": datasource2.get('type', 'unknown'),
-                    "change": "added",
-                    "status": datasource2.get('status', 'unknown'),
-                    "old_status": None
-                })
-            elif not datasource2:
+            if datasource2 is None:
                 host_result["datasource_changes"].append({
                     "name": ds_name,
                     "type": datasource1.get('type', 'unknown'),
@@ -247,25 +312,24 @@ def compare_hosts(hosts1, hosts2):
                     "old_status": datasource1.get('status', 'unknown')
                 })
         
+        for ds_name, datasource2 in ds2.items():
+            if ds_name not in ds1:
+                host_result["datasource_changes"].append({
+                    "name": ds_name,
+                    "type": datasource2.get('type', 'unknown'),
+                    "change": "added",
+                    "status": datasource2.get('status', 'unknown'),
+                    "old_status": None
+                })
+        
         # Compare deployments
         dep1 = {dep['name']: dep for dep in host1.get('status', {}).get('deployments', []) if 'name' in dep}
         dep2 = {dep['name']: dep for dep in host2.get('status', {}).get('deployments', []) if 'name' in dep}
         
-        # Find all unique deployments
-        all_deployments = set(dep1.keys()) | set(dep2.keys())
-        
-        for dep_name in all_deployments:
-            deployment1 = dep1.get(dep_name)
+        for dep_name, deployment1 in dep1.items():
             deployment2 = dep2.get(dep_name)
             
-            if not deployment1:
-                host_result["deployment_changes"].append({
-                    "name": dep_name,
-                    "change": "added",
-                    "status": deployment2.get('status', 'unknown'),
-                    "old_status": None
-                })
-            elif not deployment2:
+            if deployment2 is None:
                 host_result["deployment_changes"].append({
                     "name": dep_name,
                     "change": "removed",
@@ -280,9 +344,46 @@ def compare_hosts(hosts1, hosts2):
                     "old_status": deployment1.get('status', 'unknown')
                 })
         
+        for dep_name, deployment2 in dep2.items():
+            if dep_name not in dep1:
+                host_result["deployment_changes"].append({
+                    "name": dep_name,
+                    "change": "added",
+                    "status": deployment2.get('status', 'unknown'),
+                    "old_status": None
+                })
+        
+        host_result["has_changes"] = (host_result["status_changed"]
+                                      or bool(host_result["datasource_changes"])
+                                      or bool(host_result["deployment_changes"]))
         comparison_results.append(host_result)
+        if host_result["status_changed"]:
+            status_changes += 1
+        datasource_changes += len(host_result["datasource_changes"])
+        deployment_changes += len(host_result["deployment_changes"])
+    
+    # Hosts that exist only in the second report
+    for host_key, host2 in hosts2_dict.items():
+        if host_key not in hosts1_dict:
+            comparison_results.append({
+                "host": host2['host'],
+                "port": host2['port'],
+                "status": "added",
+                "instance": host2.get('instance', 'unknown'),
+                "instance_status": host2.get('status', {}).get('instance_status', 'unknown'),
+                "old_instance_status": None,
+                "status_changed": True,
+                "has_changes": True,
+                "datasource_changes": [],
+                "deployment_changes": []
+            })
+            status_changes += 1
     
-    return comparison_results
+    return comparison_results, {
+        "status_changes": status_changes,
+        "datasource_changes": datasource_changes,
+        "deployment_changes": deployment_changes
+    }
 
 def generate_comparison_pdf(comparison_id, comparison_data):
     """
@@ -299,41 +400,6 @@ def generate_comparison_pdf(comparison_id, comparison_data):
     report_path = os.path.join(Config.REPORTS_PATH, f"{comparison_id}.pdf")
     doc = SimpleDocTemplate(report_path, pagesize=letter)
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    heading_style = styles['Heading2']
-    heading3_style = styles['Heading3']
-    normal_style = styles['Normal']
-    
-    # Create custom styles
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        parent=styles['Normal'],
-        alignment=TA_CENTER
-    )
-    
-    up_style = ParagraphStyle(
-        'UpStatus',
-        parent=styles['Normal'],
-        textColor=colors.green,
-        fontName='Helvetica-Bold'
-    )
-    
-    down_style = ParagraphStyle(
-        'DownStatus',
-        parent=styles['Normal'],
-        textColor=colors.red,
-        fontName='Helvetica-Bold'
-    )
-    
-    unknown_style = ParagraphStyle(
-        'UnknownStatus',
-        parent=styles['Normal'],
-        textColor=colors.gray,
-        fontName='Helvetica-Bold'
-    )
-    
     # Build document content
     content = []
     
@@ -342,10 +408,10 @@ def generate_comparison_pdf(comparison_id, comparison_data):
     report2_date = format_date(comparison_data['report2']['created_at'])
     environment = comparison_data['report1']['environment'].replace('_', ' ').capitalize()
     
-    content.append(Paragraph(f"{environment} JBoss Status Comparison", title_style))
+    content.append(Paragraph(f"{environment} JBoss Status Comparison", _TITLE_STYLE))
     content.append(Spacer(1, 12))
     
-    content.append(Paragraph(f"Comparing reports from {report1_date} and {report2_date}", center_style))
+    content.append(Paragraph(f"Comparing reports from {report1_date} and {report2_date}", _CENTER_STYLE))
     content.append(Spacer(1, 12))
     
     # Summary table
@@ -358,31 +424,27 @@ def generate_comparison_pdf(comparison_id, comparison_data):
     ]
     
     summary_table = Table(summary_data, colWidths=[200, 100])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
     content.append(summary_table)
     content.append(Spacer(1, 20))
     
     # Add host comparison details
-    content.append(Paragraph("Host Status Changes", heading_style))
+    content.append(Paragraph("Host Status Changes", _HEADING_STYLE))
     content.append(Spacer(1, 10))
     
-    hosts_with_changes = [h for h in comparison_data['hosts'] if 
-        h['status_changed'] or h['datasource_changes'] or h['deployment_changes']]
+    # has_changes is set by compare_hosts; peek at the first changed host to detect an empty result
+    hosts_with_changes = (h for h in comparison_data['hosts'] if h.get('has_changes'))
+    first_changed = next(hosts_with_changes, None)
     
-    if not hosts_with_changes:
-        content.append(Paragraph("No changes detected between the two reports.", normal_style))
+    if first_changed is None:
+        content.append(Paragraph("No changes detected between the two reports.", _NORMAL_STYLE))
     else:
-        for host in hosts_with_changes:
+        for host in itertools.chain((first_changed,), hosts_with_changes):
+            ds_changes = host['datasource_changes']
+            dep_changes = host['deployment_changes']
+            
             # Host header
-            content.append(Paragraph(f"{host['host']}:{host['port']} ({host['instance']})", heading3_style))
+            content.append(Paragraph(f"{host['host']}:{host['port']} ({host['instance']})", _H3_STYLE))
             
             # Host status change
             if host['status_changed']:
@@ -395,11 +457,7 @@ def generate_comparison_pdf(comparison_id, comparison_data):
                 
                 status_table = Table(status_data, colWidths=[150, 150, 150])
                 status_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+                    *_STATUS_TABLE_CMDS,
                     ('BACKGROUND', (1, 0), (1, -1), get_status_color(host['old_instance_status'], 0.2)),
                     ('BACKGROUND', (2, 0), (2, -1), get_status_color(host['instance_status'], 0.2)),
                 ]))
@@ -407,91 +465,69 @@ def generate_comparison_pdf(comparison_id, comparison_data):
                 content.append(Spacer(1, 10))
             
             # Datasource changes
-            if host['datasource_changes']:
-                content.append(Paragraph("Datasource Changes:", normal_style))
+            if ds_changes:
+                content.append(Paragraph("Datasource Changes:", _NORMAL_STYLE))
                 ds_data = [['Datasource', 'Type', 'Change', 'Old Status', 'New Status']]
                 
-                for ds in host['datasource_changes']:
+                style_cmds = list(_CHANGE_TABLE_CMDS)
+                
+                # Status cell colours come from the raw statuses while each row is built
+                for i, ds in enumerate(ds_changes, 1):
+                    old_status = ds['old_status']
+                    new_status = ds['status']
                     ds_data.append([
                         ds['name'],
                         ds['type'],
-                        ds['change'].replace('_', ' ').capitalize(),
-                        get_status_text(ds['old_status']) if ds['old_status'] else 'N/A',
-                        get_status_text(ds['status']) if ds['status'] else 'N/A',
+                        _change_label(ds['change']),
+                        get_status_text(old_status) if old_status else 'N/A',
+                        get_status_text(new_status) if new_status else 'N/A',
                     ])
-                
-                ds_table = Table(ds_data, colWidths=[120, 80, 80, 80, 80])
-                ds_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                
-                # Add colors for status cells
-                for i, row in enumerate(ds_data[1:], 1):
-                    old_status = row[3]
-                    new_status = row[4]
                     
-                    if old_status != 'N/A':
-                        ds_table.setStyle(TableStyle([
-                            ('BACKGROUND', (3, i), (3, i), get_status_color(old_status.lower(), 0.2)),
-                        ]))
+                    if old_status:
+                        style_cmds.append(('BACKGROUND', (3, i), (3, i), get_status_color(old_status, 0.2)))
                     
-                    if new_status != 'N/A':
-                        ds_table.setStyle(TableStyle([
-                            ('BACKGROUND', (4, i), (4, i), get_status_color(new_status.lower(), 0.2)),
-                        ]))
+                    if new_status:
+                        style_cmds.append(('BACKGROUND', (4, i), (4, i), get_status_color(new_status, 0.2)))
+                
+                ds_table = Table(ds_data, colWidths=[120, 80, 80, 80, 80])
+                ds_table.setStyle(TableStyle(style_cmds))
                 
                 content.append(ds_table)
                 content.append(Spacer(1, 10))
             
             # Deployment changes
-            if host['deployment_changes']:
-                content.append(Paragraph("Deployment Changes:", normal_style))
+            if dep_changes:
+                content.append(Paragraph("Deployment Changes:", _NORMAL_STYLE))
                 dep_data = [['Deployment', 'Change', 'Old Status', 'New Status']]
                 
-                for dep in host['deployment_changes']:
+                style_cmds = list(_CHANGE_TABLE_CMDS)
+                
+                # Status cell colours come from the raw statuses while each row is built
+                for i, dep in enumerate(dep_changes, 1):
+                    old_status = dep['old_status']
+                    new_status = dep['status']
                     dep_data.append([
                         dep['name'],
-                        dep['change'].replace('_', ' ').capitalize(),
-                        get_status_text(dep['old_status']) if dep['old_status'] else 'N/A',
-                        get_status_text(dep['status']) if dep['status'] else 'N/A',
+                        _change_label(dep['change']),
+                        get_status_text(old_status) if old_status else 'N/A',
+                        get_status_text(new_status) if new_status else 'N/A',
                     ])
-                
-                dep_table = Table(dep_data, colWidths=[200, 80, 80, 80])
-                dep_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                
-                # Add colors for status cells
-                for i, row in enumerate(dep_data[1:], 1):
-                    old_status = row[2]
-                    new_status = row[3]
                     
-                    if old_status != 'N/A':
-                        dep_table.setStyle(TableStyle([
-                            ('BACKGROUND', (2, i), (2, i), get_status_color(old_status.lower(), 0.2)),
-                        ]))
+                    if old_status:
+                        style_cmds.append(('BACKGROUND', (2, i), (2, i), get_status_color(old_status, 0.2)))
                     
-                    if new_status != 'N/A':
-                        dep_table.setStyle(TableStyle([
-                            ('BACKGROUND', (3, i), (3, i), get_status_color(new_status.lower(), 0.2)),
-                        ]))
+                    if new_status:
+                        style_cmds.append(('BACKGROUND', (3, i), (3, i), get_status_color(new_status, 0.2)))
+                
+                dep_table = Table(dep_data, colWidths=[200, 80, 80, 80])
+                dep_table.setStyle(TableStyle(style_cmds))
                 
                 content.append(dep_table)
             
             content.append(Spacer(1, 20))
     
     # Add legend
-    content.append(Paragraph("Status Legend:", heading3_style))
+    content.append(Paragraph("Status Legend:", _H3_STYLE))
     
     legend_data = [
         ["UP", "Server/component is running and available"],
@@ -500,28 +536,20 @@ def generate_comparison_pdf(comparison_id, comparison_data):
     ]
     
     legend_table = Table(legend_data, colWidths=[100, 300])
-    legend_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
-        ('BACKGROUND', (0, 1), (0, 1), colors.lightpink),
-        ('BACKGROUND', (0, 2), (0, 2), colors.lightgrey),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    legend_table.setStyle(LEGEND_TABLE_STYLE)
     content.append(legend_table)
     
     # Add footer
     content.append(Spacer(1, 30))
     content.append(Paragraph(f"Comparison generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                            styles['Italic']))
+                            _ITALIC_STYLE))
     
     # Build PDF
     try:
         doc.build(content)
         return report_path
     except Exception as e:
-        logger.error(f"Error building comparison PDF: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error building comparison PDF: %s", e)
         raise
 
 def format_date(date_string):
@@ -533,22 +561,31 @@ def format_date(date_string):
         logger.error(f"Error formatting date {date_string}: {e}")
         return date_string or "Unknown"
 
+# Labels for the fixed set of change kinds compare_hosts produces
+_CHANGE_LABEL = {'added': 'Added', 'removed': 'Removed', 'status_changed': 'Status changed'}
+
+def _change_label(change):
+    """Display label for a datasource or deployment change"""
+    label = _CHANGE_LABEL.get(change)
+    if label is None:
+        label = change.replace('_', ' ').capitalize()
+    return label
+
+# Display text and cell colour per status, including the casings seen in reports and tables
+_STATUS_TEXT = {'up': 'UP', 'UP': 'UP', 'Up': 'UP', 'down': 'DOWN', 'DOWN': 'DOWN', 'Down': 'DOWN'}
+_STATUS_COLOR = {'up': colors.lightgreen, 'UP': colors.lightgreen, 'Up': colors.lightgreen,
+                 'down': colors.lightpink, 'DOWN': colors.lightpink, 'Down': colors.lightpink}
+
 def get_status_text(status):
     """Convert status to display text"""
-    if not status:
-        return "UNKNOWN"
-    
-    return status.upper()
+    text = _STATUS_TEXT.get(status)
+    if text is None:
+        text = status.upper() if status else "UNKNOWN"
+    return text
 
 def get_status_color(status, alpha=1.0):
     """Get color for a status"""
-    if not status:
-        return colors.lightgrey
-    
-    status = status.lower()
-    if status == 'up':
-        return colors.lightgreen
-    elif status == 'down':
-        return colors.lightpink
-    else:
-        return colors.lightgrey
+    color = _STATUS_COLOR.get(status)
+    if color is None:
+        color = _STATUS_COLOR.get(status.lower(), colors.lightgrey) if status else colors.lightgrey
+    return color
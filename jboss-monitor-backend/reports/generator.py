@@ -1,91 +1,412 @@
 # reports/generator.py
 import os
 import csv
+import json
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple
+from functools import lru_cache
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, KeepTogether
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
 from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def generate_pdf_report(report_id, environment, host_status):
-    """
-    Generate a PDF report for the given host status with enhanced color coding
+# Table styles are identical for every host, so build them once at import
+DS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 10),
+    ('BOTTOMPADDING', (0,0), (-1,0), 8),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('ALIGN', (2,1), (2,-1), 'CENTER'),  # Status column centered
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey])
+])
+
+DEP_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 10),
+    ('BOTTOMPADDING', (0,0), (-1,0), 8),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('ALIGN', (1,1), (1,-1), 'CENTER'),  # Status column centered
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey])
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    # Header styling
+    ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,0), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 12),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
     
-    :param report_id: Unique identifier for the report
-    :param environment: Production or non-production environment
-    :param host_status: List of hosts with their status
+    # Row styling - alternate colors
+    ('BACKGROUND', (0,1), (-1,-1), colors.lightgrey),
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey]),
+    
+    # Grid
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    
+    # Alignment for specific columns
+    ('ALIGN', (3,1), (3,-1), 'CENTER'),  # Status column centered
+    ('ALIGN', (5,1), (6,-1), 'CENTER'),  # Datasources and Deployments centered
+])
+
+# The sample stylesheet and status styles are read-only, so build them once per process
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = _STYLES['Title']
+_HEADING_STYLE = _STYLES['Heading2']
+_H3_STYLE = _STYLES['Heading3']
+_H4_STYLE = _STYLES['Heading4']
+_NORMAL_STYLE = _STYLES['Normal']
+_ITALIC_STYLE = _STYLES['Italic']
+
+# Custom styles for status
+_UP_STYLE = ParagraphStyle(
+    'UpStatus',
+    parent=_NORMAL_STYLE,
+    textColor=colors.green,
+    fontName='Helvetica-Bold'
+)
+
+_DOWN_STYLE = ParagraphStyle(
+    'DownStatus',
+    parent=_NORMAL_STYLE,
+    textColor=colors.red,
+    fontName='Helvetica-Bold'
+)
+
+_UNKNOWN_STYLE = ParagraphStyle(
+    'UnknownStatus',
+    parent=_NORMAL_STYLE,
+    textColor=colors.gray,
+    fontName='Helvetica-Bold'
+)
+
+_STATUS_STYLES = {'UP': _UP_STYLE, 'DOWN': _DOWN_STYLE}
+
+@lru_cache(maxsize=64)
+def _status_cell(text, style):
+    """Shared status Paragraph; tables re-wrap every cell before drawing it, so one instance can fill many cells"""
+    return Paragraph(text, style)
+
+def _host_header_style(bg_color):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), bg_color),
+        ('BOX', (0, 0), (-1, -1), 1, colors.black),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+# Host header table style and status text style per instance status
+_HOST_HEADER_STYLES = {
+    'UP': (_host_header_style(colors.lightgreen), _UP_STYLE),
+    'DOWN': (_host_header_style(colors.lightpink), _DOWN_STYLE),
+}
+_UNKNOWN_HOST_HEADER_STYLE = (_host_header_style(colors.lightgrey), _UNKNOWN_STYLE)
+
+LEGEND_TABLE_STYLE = TableStyle([
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+    ('PADDING', (0,0), (-1,-1), 6),
+])
+
+def _save_report_data(report_id, hosts):
+    """
+    Store the raw host data for future comparisons as compact JSON,
+    zstd-compressed to {report_id}.json.zst when zstandard is installed
     """
-    # Use absolute path
-    report_path = os.path.join(Config.REPORTS_PATH, f"{report_id}.pdf")
     data_path = os.path.join(Config.REPORTS_PATH, f"{report_id}.json")
-    # Store the raw data in JSON format for easy comparison
     try:
-        with open(data_path, 'w') as f:
-            json.dump(host_status, f, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(hosts)
+        else:
+            payload = json.dumps(hosts, separators=(',', ':')).encode('utf-8')
+        if zstandard is not None:
+            data_path += '.zst'
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        with open(data_path, 'wb') as f:
+            f.write(payload)
         logger.info(f"Saved report data to {data_path} for future comparisons")
     except Exception as e:
-        logger.error(f"Error saving report data: {str(e)}") 
-    # Create reports directory if it doesn't exist
-    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        logger.error(f"Error saving report data ({type(e).__name__}): {str(e)}")
+
+def _save_compressed_copy(report_path):
+    """Keep a zstd copy of a finished report next to it, for downloads by clients that accept zstd"""
+    if zstandard is None:
+        return
+    tmp_path = report_path + '.zst.tmp'
+    try:
+        with open(report_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+        os.replace(tmp_path, report_path + '.zst')
+    except Exception as e:
+        logger.error(f"Error compressing report {report_path} ({type(e).__name__}): {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _up_total(items):
+    """(up, total) for a datasource or deployment list, counted in a single pass"""
+    up = total = 0
+    for item in items:
+        total += 1
+        if item.get('status') == 'up':
+            up += 1
+    return up, total
+
+def _count_columns(host_state):
+    """The 'up/total' datasource and deployment cells shared by the PDF and CSV summaries"""
+    ds_up, ds_total = _up_total(host_state.get('datasources', []))
+    dep_up, dep_total = _up_total(host_state.get('deployments', []))
+    return f"{ds_up}/{ds_total}", f"{dep_up}/{dep_total}"
+
+def _summary_last_check(host_state):
+    """Last check as shown in the summary row; missing values are passed through unchanged"""
+    last_check = host_state.get('last_check', 'Never')
+    # Format datetime if it exists
+    if last_check and last_check != 'Never':
+        last_check = formatLastCheck(last_check)
+    return last_check
+
+# Display text for the usual statuses, so rows don't upper-case each one
+_STATUS_TEXT = {'up': 'UP', 'down': 'DOWN', 'unknown': 'UNKNOWN'}
+
+def _status_text(status):
+    text = _STATUS_TEXT.get(status)
+    if text is None:
+        text = status.upper()
+    return text
+
+@lru_cache(maxsize=64)
+def _item_status_cell(status):
+    """Coloured status cell for a datasource or deployment; anything but UP is shown in the DOWN style"""
+    text = _status_text(status)
+    return _status_cell(text, _UP_STYLE if text == 'UP' else _DOWN_STYLE)
+
+# Flat per-host values shared by the PDF summary table and the CSV rows
+HostSummary = namedtuple('HostSummary', 'host port instance status last_check ds_text dep_text')
+
+def _summarize(host):
+    """Read the nested host status once into a HostSummary"""
+    host_state = host['status']
+    ds_text, dep_text = _count_columns(host_state)
+    return HostSummary(
+        host['host'],
+        host['port'],
+        host['instance'],
+        _status_text(host_state.get('instance_status', 'unknown')),
+        _summary_last_check(host_state),
+        ds_text,
+        dep_text
+    )
+
+def _summary_row(summary):
+    """One row of the PDF summary table"""
+    # Create styled status text based on status
+    status_text = _status_cell(summary.status, _STATUS_STYLES.get(summary.status, _UNKNOWN_STYLE))
     
-    print(f"Generating PDF report at: {report_path}")
+    return [
+        summary.host,
+        str(summary.port),
+        summary.instance,
+        status_text,
+        summary.last_check,
+        summary.ds_text,
+        summary.dep_text
+    ]
+
+def _host_details(host, summary=None):
+    """Flowables for one host's detail section, reusing the status and last check from its summary row"""
+    host_state = host['status']
+    details = []
+    if summary is None:
+        summary = _summarize(host)
     
-    # Create PDF document
-    doc = SimpleDocTemplate(report_path, pagesize=letter)
-    # Create reports directory if it doesn't exist
-    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    # Host header with background color based on status
+    header_style, status_style = _HOST_HEADER_STYLES.get(summary.status, _UNKNOWN_HOST_HEADER_STYLE)
+        
+    # Create a mini table for the host header with background color
+    host_header = Table(
+        [[Paragraph(f"Host: {host['host']}:{host['port']} ({host['instance']})", _H3_STYLE),
+          _status_cell(summary.status, status_style)]],
+        colWidths=['80%', '20%']
+    )
+    host_header.setStyle(header_style)
     
-    print(f"Generating PDF report at: {report_path}")
+    # Status summary, kept on the same page as its header
+    status_text = f"Last Check: {summary.last_check or 'Never'}"
+    details.append(KeepTogether([host_header, Spacer(1, 5), Paragraph(status_text, _NORMAL_STYLE)]))
+    details.append(Spacer(1, 10))
     
-    # Create PDF document
-    doc = SimpleDocTemplate(report_path, pagesize=letter)
+    # Datasources
+    datasources = host_state.get('datasources', [])
+    if datasources:
+        details.append(Paragraph("Datasources:", _H4_STYLE))
+        ds_data = [['Name', 'Type', 'Status']]
+        for ds in datasources:
+            ds_data.append([
+                ds.get('name', 'Unknown'),
+                ds.get('type', 'Unknown'),
+                _item_status_cell(ds.get('status', 'unknown'))
+            ])
+        
+        ds_table = Table(ds_data, repeatRows=1)
+        ds_table.setStyle(DS_TABLE_STYLE)
+        details.append(ds_table)
+    else:
+        details.append(Paragraph("Datasources: None found", _NORMAL_STYLE))
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    heading_style = styles['Heading2']
-    normal_style = styles['Normal']
+    details.append(Spacer(1, 10))
     
-    # Create custom styles for status
-    up_style = ParagraphStyle(
-        'UpStatus',
-        parent=styles['Normal'],
-        textColor=colors.green,
-        fontName='Helvetica-Bold'
-    )
+    # Deployments
+    deployments = host_state.get('deployments', [])
+    if deployments:
+        details.append(Paragraph("Deployments:", _H4_STYLE))
+        dep_data = [['Name', 'Status']]
+        for dep in deployments:
+            dep_data.append([
+                dep.get('name', 'Unknown'),
+                _item_status_cell(dep.get('status', 'unknown'))
+            ])
+        
+        dep_table = Table(dep_data, repeatRows=1)
+        dep_table.setStyle(DEP_TABLE_STYLE)
+        details.append(dep_table)
+    else:
+        details.append(Paragraph("Deployments: None found", _NORMAL_STYLE))
     
-    down_style = ParagraphStyle(
-        'DownStatus',
-        parent=styles['Normal'],
-        textColor=colors.red,
-        fontName='Helvetica-Bold'
-    )
+    details.append(Spacer(1, 20))
+    return details
+
+def _legend():
+    """Status legend and footer closing the report"""
+    content = []
     
-    unknown_style = ParagraphStyle(
-        'UnknownStatus',
-        parent=styles['Normal'],
-        textColor=colors.gray,
-        fontName='Helvetica-Bold'
-    )
+    # Legend for status colors
+    legend_data = [
+        [Paragraph('Status Legend:', _H4_STYLE)]
+    ]
+    legend_table = Table(legend_data)
+    content.append(legend_table)
+    content.append(Spacer(1, 5))
     
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        parent=styles['Normal'],
-        alignment=TA_CENTER
-    )
+    # Create status legend
+    status_legend = Table([
+        [_status_cell('UP', _UP_STYLE), 'Server/component is running and available'],
+        [_status_cell('DOWN', _DOWN_STYLE), 'Server/component is not running or not available'],
+        [_status_cell('UNKNOWN', _UNKNOWN_STYLE), 'Status could not be determined']
+    ])
+    status_legend.setStyle(LEGEND_TABLE_STYLE)
+    content.append(status_legend)
+    content.append(Spacer(1, 12))
+    
+    # Add footer with timestamp
+    content.append(Paragraph(f"Report generated by JBoss Monitor on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
+                            _ITALIC_STYLE))
+    return content
+
+def _render_host_chunk(part_path, hosts, with_legend):
+    """
+    Render the detail sections of a slice of hosts to their own PDF in a worker process
+    """
+    content = []
+    for host, summary in hosts:
+        content.extend(_host_details(host, summary))
+    if with_legend:
+        content.extend(_legend())
+    SimpleDocTemplate(part_path, pagesize=letter).build(content)
+    return part_path
+
+def _render_parallel(report_path, head, hosts, processes):
+    """
+    Render the summary in this process and the host details in a process pool,
+    then concatenate the parts into report_path
+    
+    Hosts are split into batches of PDF_BATCH_HOSTS, so each layout stays small and
+    busy workers pick up the next batch as they finish. Each part starts on a new
+    page. Layout is CPU-bound, so threads would not help.
+    """
+    size = Config.PDF_BATCH_HOSTS or -(-len(hosts) // processes)
+    chunks = [hosts[i:i + size] for i in range(0, len(hosts), size)]
+    head_path = f"{report_path}.part-head"
+    part_paths = [f"{report_path}.part{i}" for i in range(len(chunks))]
+    try:
+        SimpleDocTemplate(head_path, pagesize=letter).build(head)
+        # spawn, not fork: the app process runs many threads that a forked child would inherit mid-lock
+        with multiprocessing.get_context('spawn').Pool(processes=min(processes, len(chunks))) as pool:
+            pool.starmap(_render_host_chunk, [
+                (part_paths[i], chunk, i == len(chunks) - 1) for i, chunk in enumerate(chunks)
+            ], chunksize=1)
+        
+        writer = PdfWriter()
+        for path in [head_path] + part_paths:
+            writer.append(path)
+        with open(report_path, 'wb') as f:
+            writer.write(f)
+        writer.close()
+    finally:
+        for path in [head_path] + part_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def generate_pdf_report(report_id, environment, host_status):
+    """
+    Generate a PDF report for the given host status with enhanced color coding
+    
+    Large reports have their host details laid out in parallel processes
+    when pypdf is available to merge the parts.
+    
+    :param report_id: Unique identifier for the report
+    :param environment: Production or non-production environment
+    :param host_status: Iterable of hosts with their status, consumed once
+    """
+    # Use absolute path
+    report_path = os.path.join(Config.REPORTS_PATH, f"{report_id}.pdf")
+    
+    # Create reports directory if it doesn't exist; the PDF and its data file share it
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    
+    logger.debug("Generating PDF report at: %s", report_path)
     
     # Content components
     content = []
     
     # Title
-    content.append(Paragraph(f"{environment.capitalize()} JBoss Monitor Report", title_style))
-    content.append(Paragraph(f"Report ID: {report_id}", normal_style))
-    content.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
+    content.append(Paragraph(f"{environment.capitalize()} JBoss Monitor Report", _TITLE_STYLE))
+    content.append(Paragraph(f"Report ID: {report_id}", _NORMAL_STYLE))
+    content.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _NORMAL_STYLE))
     content.append(Spacer(1, 12))
     
     # Prepare table data
@@ -93,238 +414,114 @@ def generate_pdf_report(report_id, environment, host_status):
         ['Host', 'Port', 'Instance', 'Status', 'Last Check', 'Datasources', 'Deployments']
     ]
     
+    # Summary rows are built in one pass, so host_status can be any iterable
+    # Hosts are kept with their summary, so the detail pages reuse its status text and last check
+    hosts = []
+    append_host = hosts.append
+    append_row = table_data.append
     for host in host_status:
-        datasource_status = host['status'].get('datasources', [])
-        deployment_status = host['status'].get('deployments', [])
-        
-        last_check = host['status'].get('last_check', 'Never')
-        # Format datetime if it exists
-        if last_check and last_check != 'Never':
-            try:
-                # Try to parse ISO format date
-                check_date = datetime.fromisoformat(last_check)
-                last_check = check_date.strftime('%Y-%m-%d %H:%M:%S')
-            except (ValueError, TypeError):
-                # Keep as is if parsing fails
-                pass
-        
-        # Create styled status text based on status
-        status = host['status'].get('instance_status', 'unknown').upper()
-        if status == 'UP':
-            status_text = Paragraph(status, up_style)
-        elif status == 'DOWN':
-            status_text = Paragraph(status, down_style)
-        else:
-            status_text = Paragraph(status, unknown_style)
-        
-        # Create datasource and deployment counts with color coding
-        ds_up = sum(1 for ds in datasource_status if ds.get('status') == 'up')
-        ds_total = len(datasource_status)
-        ds_text = f"{ds_up}/{ds_total}"
-        
-        dep_up = sum(1 for dep in deployment_status if dep.get('status') == 'up')
-        dep_total = len(deployment_status)
-        dep_text = f"{dep_up}/{dep_total}"
-        
-        # Add row to table
-        table_data.append([
-            host['host'],
-            str(host['port']),
-            host['instance'],
-            status_text,
-            last_check,
-            ds_text,
-            dep_text
-        ])
+        summary = _summarize(host)
+        append_host((host, summary))
+        append_row(_summary_row(summary))
+    
+    # Store the raw data for easy comparison with later reports
+    _save_report_data(report_id, [host for host, _ in hosts])
     
     # Create table with enhanced styling
     table = Table(table_data, repeatRows=1)
-    table.setStyle(TableStyle([
-        # Header styling
-        ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('ALIGN', (0,0), (-1,0), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 12),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        
-        # Row styling - alternate colors
-        ('BACKGROUND', (0,1), (-1,-1), colors.lightgrey),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey]),
-        
-        # Grid
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        
-        # Alignment for specific columns
-        ('ALIGN', (3,1), (3,-1), 'CENTER'),  # Status column centered
-        ('ALIGN', (5,1), (6,-1), 'CENTER'),  # Datasources and Deployments centered
-    ]))
+    table.setStyle(SUMMARY_TABLE_STYLE)
     
     content.append(table)
     content.append(Spacer(1, 12))
     
-    # Add details for each host
-    content.append(Paragraph("Detailed Status", heading_style))
-    content.append(Spacer(1, 6))
-    
-    for host in host_status:
-        # Host header with background color based on status
-        host_status_value = host['status'].get('instance_status', 'unknown').lower()
-        if host_status_value == 'up':
-            bg_color = colors.lightgreen
-            status_style = up_style
-        elif host_status_value == 'down':
-            bg_color = colors.lightpink
-            status_style = down_style
-        else:
-            bg_color = colors.lightgrey
-            status_style = unknown_style
-            
-        # Create a mini table for the host header with background color
-        host_header = Table(
-            [[Paragraph(f"Host: {host['host']}:{host['port']} ({host['instance']})", styles['Heading3']),
-              Paragraph(host_status_value.upper(), status_style)]],
-            colWidths=['80%', '20%']
-        )
-        host_header.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), bg_color),
-            ('BOX', (0, 0), (-1, -1), 1, colors.black),
-            ('PADDING', (0, 0), (-1, -1), 6),
-            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        content.append(host_header)
-        content.append(Spacer(1, 5))
-        
-        # Status summary
-        status_text = f"Last Check: {formatLastCheck(host['status'].get('last_check'))}"
-        content.append(Paragraph(status_text, normal_style))
-        content.append(Spacer(1, 10))
-        
-        # Datasources
-        datasources = host['status'].get('datasources', [])
-        if datasources:
-            content.append(Paragraph("Datasources:", styles['Heading4']))
-            ds_data = [['Name', 'Type', 'Status']]
-            for ds in datasources:
-                # Apply color to status
-                ds_status = ds.get('status', 'unknown').upper()
-                if ds_status == 'UP':
-                    status_cell = Paragraph(ds_status, up_style)
-                else:
-                    status_cell = Paragraph(ds_status, down_style)
-                    
-                ds_data.append([
-                    ds.get('name', 'Unknown'),
-                    ds.get('type', 'Unknown'),
-                    status_cell
-                ])
-            
-            ds_table = Table(ds_data, repeatRows=1)
-            ds_table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0,0), (-1,0), 10),
-                ('BOTTOMPADDING', (0,0), (-1,0), 8),
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
-                ('ALIGN', (2,1), (2,-1), 'CENTER'),  # Status column centered
-                ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey])
-            ]))
-            content.append(ds_table)
-        else:
-            content.append(Paragraph("Datasources: None found", normal_style))
-        
-        content.append(Spacer(1, 10))
-        
-        # Deployments
-        deployments = host['status'].get('deployments', [])
-        if deployments:
-            content.append(Paragraph("Deployments:", styles['Heading4']))
-            dep_data = [['Name', 'Status']]
-            for dep in deployments:
-                # Apply color to status
-                dep_status = dep.get('status', 'unknown').upper()
-                if dep_status == 'UP':
-                    status_cell = Paragraph(dep_status, up_style)
-                else:
-                    status_cell = Paragraph(dep_status, down_style)
-                    
-                dep_data.append([
-                    dep.get('name', 'Unknown'),
-                    status_cell
-                ])
-            
-            dep_table = Table(dep_data, repeatRows=1)
-            dep_table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0,0), (-1,0), 10),
-                ('BOTTOMPADDING', (0,0), (-1,0), 8),
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
-                ('ALIGN', (1,1), (1,-1), 'CENTER'),  # Status column centered
-                ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.lightgrey])
-            ]))
-            content.append(dep_table)
-        else:
-            content.append(Paragraph("Deployments: None found", normal_style))
-        
-        content.append(Spacer(1, 20))
-    
-    # Legend for status colors
-    legend_data = [
-        [Paragraph('Status Legend:', styles['Heading4'])]
-    ]
-    legend_table = Table(legend_data)
-    content.append(legend_table)
-    content.append(Spacer(1, 5))
-    
-    # Create status legend
-    status_legend = Table([
-        [Paragraph('UP', up_style), 'Server/component is running and available'],
-        [Paragraph('DOWN', down_style), 'Server/component is not running or not available'],
-        [Paragraph('UNKNOWN', unknown_style), 'Status could not be determined']
-    ])
-    status_legend.setStyle(TableStyle([
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ('PADDING', (0,0), (-1,-1), 6),
-    ]))
-    content.append(status_legend)
-    content.append(Spacer(1, 12))
+    # Add details for each host, unless there are so many that layout would dominate the render
+    limit = Config.PDF_MAX_DETAIL_HOSTS
+    if limit and len(hosts) > limit:
+        content.append(Paragraph(
+            f"Detailed status omitted: this report covers {len(hosts)} hosts, "
+            f"more than the limit of {limit}. The summary above lists every host.", _NORMAL_STYLE))
+        content.append(Spacer(1, 12))
+        hosts = []
+    else:
+        content.append(Paragraph("Detailed Status", _HEADING_STYLE))
+        content.append(Spacer(1, 6))
     
-    # Add footer with timestamp
-    content.append(Paragraph(f"Report generated by JBoss Monitor on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                            styles['Italic']))
+    processes = min(Config.PDF_RENDER_PROCESSES or os.cpu_count() or 1, len(hosts))
+    parallel = PdfWriter is not None and processes > 1 and len(hosts) >= Config.PDF_PARALLEL_MIN_HOSTS
     
     # Build PDF
     try:
-        doc.build(content)
-        print(f"PDF generated successfully at {report_path}")
-    except Exception as e:
-        import traceback
-        print(f"Error building PDF: {str(e)}")
-        print(traceback.format_exc())
+        if parallel:
+            _render_parallel(report_path, content, hosts, processes)
+        else:
+            for host, summary in hosts:
+                content.extend(_host_details(host, summary))
+            content.extend(_legend())
+            SimpleDocTemplate(report_path, pagesize=letter).build(content)
+        logger.info("PDF generated successfully at %s", report_path)
+        _save_compressed_copy(report_path)
+    except Exception:
+        logger.exception("Error building PDF %s", report_path)
         raise
     
     return report_path
 
+# Process pool that renders whole PDF reports, so ReportLab layout doesn't hold this process's GIL.
+# Created on first use: spawned children import this module too and must not start their own.
+_PDF_POOL = None
+_pdf_pool_lock = threading.Lock()
+
+def _init_pdf_worker(reports_path):
+    """Point a render process at the same reports directory as the app"""
+    Config.REPORTS_PATH = reports_path
+
+def _get_pdf_pool():
+    global _PDF_POOL
+    with _pdf_pool_lock:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=Config.REPORT_CONCURRENCY,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_pdf_worker,
+                initargs=(Config.REPORTS_PATH,)
+            )
+        return _PDF_POOL
+
+def submit_pdf_report(report_id, environment, host_status):
+    """
+    Render a PDF report in the render process pool and return its Future
+
+    host_status is materialised into a list, since it has to be pickled
+    to reach the worker process.
+    """
+    return _get_pdf_pool().submit(generate_pdf_report, report_id, environment, list(host_status))
+
+_from_iso = datetime.fromisoformat
+_STRFMT = '%Y-%m-%d %H:%M:%S'
+
+@lru_cache(maxsize=4096)
 def formatLastCheck(lastCheck):
-    """Format the last check timestamp"""
+    """Format the last check timestamp; hosts checked in the same sweep often share one"""
     if not lastCheck:
         return 'Never'
-    
     try:
         # Try to parse ISO format date
-        check_date = datetime.fromisoformat(lastCheck)
-        return check_date.strftime('%Y-%m-%d %H:%M:%S')
+        return _from_iso(lastCheck).strftime(_STRFMT)
     except (ValueError, TypeError):
         # Keep as is if parsing fails
         return lastCheck
 
+_CSV_HEADER = ('Environment', 'Host', 'Port', 'Instance', 'Status', 'Last Check',
+               'Datasources (UP/Total)', 'Deployments (UP/Total)')
+
+def _row_iter(host_status, environment):
+    """Yield one CSV row per host; per-report values are computed once"""
+    env_label = environment.capitalize()
+    for host in host_status:
+        summary = _summarize(host)
+        yield (env_label, summary.host, summary.port, summary.instance,
+               summary.status, summary.last_check, summary.ds_text, summary.dep_text)
+
 def generate_csv_report(report_id, environment, host_status):
     """
     Generate a CSV report for the given host status
@@ -333,7 +530,7 @@ def generate_csv_report(report_id, environment, host_status):
     
     :param report_id: Unique identifier for the report
     :param environment: Production or non-production environment
-    :param host_status: List of hosts with their status
+    :param host_status: Iterable of hosts with their status, consumed once
     """
     # Use absolute path
     report_path = os.path.join(Config.REPORTS_PATH, f"{report_id}.csv")
@@ -341,57 +538,18 @@ def generate_csv_report(report_id, environment, host_status):
     # Create reports directory if it doesn't exist
     os.makedirs(os.path.dirname(report_path), exist_ok=True)
     
-    print(f"Generating CSV report at: {report_path}")
+    logger.debug("Generating CSV report at: %s", report_path)
     
-    # Write CSV file
+    # csv.writer consumes the row generator in C; the large buffer keeps writes to a few syscalls
     try:
-        with open(report_path, 'w', newline='') as csvfile:
+        with open(report_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
             writer = csv.writer(csvfile)
-            
-            # Write header
-            writer.writerow([
-                'Environment', 
-                'Host', 
-                'Port', 
-                'Instance', 
-                'Status', 
-                'Last Check', 
-                'Datasources (UP/Total)', 
-                'Deployments (UP/Total)'
-            ])
-            
-            # Write data rows
-            for host in host_status:
-                datasource_status = host['status'].get('datasources', [])
-                deployment_status = host['status'].get('deployments', [])
-                
-                last_check = host['status'].get('last_check', 'Never')
-                # Format datetime if it exists
-                if last_check and last_check != 'Never':
-                    try:
-                        # Try to parse ISO format date
-                        check_date = datetime.fromisoformat(last_check)
-                        last_check = check_date.strftime('%Y-%m-%d %H:%M:%S')
-                    except (ValueError, TypeError):
-                        # Keep as is if parsing fails
-                        pass
-                
-                writer.writerow([
-                    environment.capitalize(),
-                    host['host'],
-                    host['port'],
-                    host['instance'],
-                    host['status'].get('instance_status', 'Unknown').upper(),
-                    last_check,
-                    f"{sum(1 for ds in datasource_status if ds.get('status') == 'up')}/{len(datasource_status)}",
-                    f"{sum(1 for dep in deployment_status if dep.get('status') == 'up')}/{len(deployment_status)}"
-                ])
+            writer.writerow(_CSV_HEADER)
+            writer.writerows(_row_iter(host_status, environment))
         
-        print(f"CSV generated successfully at {report_path}")
-    except Exception as e:
-        import traceback
-        print(f"Error writing CSV: {str(e)}")
-        print(traceback.format_exc())
+        logger.info("CSV generated successfully at %s", report_path)
+    except Exception:
+        logger.exception("Error writing CSV %s", report_path)
         raise
     
     return report_path
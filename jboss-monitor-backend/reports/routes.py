@@ -1,24 +1,46 @@
 # reports/routes.py
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 import os
 import json
+import mmap
 import logging
 import uuid
+import hashlib
+import tempfile
 import threading
+import filelock
 from datetime import datetime
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from reports.comparison import compare_reports, generate_comparison_pdf
 from auth.routes import token_required
 from config import Config
 from hosts.routes import load_hosts, get_environment_path
-from monitor.routes import load_status, monitor_host
-from reports.generator import generate_pdf_report, generate_csv_report
+from monitor.routes import monitor_host_inmem
+from monitor.status_cache import status_cache
+from monitor.tasks import get_executor
+from reports.generator import submit_pdf_report, generate_csv_report
 from reports.utils import rotate_reports
 
 reports_bp = Blueprint('reports', __name__)
 # Configure logging
 logger = logging.getLogger(__name__)
+
+# Parsed reports index, reused until the file's mtime or size changes
+_INDEX_CACHE = {'path': None, 'mtime': 0, 'size': 0, 'data': None, 'by_id': None}
+_index_cache_lock = threading.Lock()
+
+# The index is kept newest first on disk, so listing it needs no sort; old entries may lack created_at
+_BY_CREATED = lambda r: r.get('created_at', '')
+
+# Bounded pool for report generation; extra requests queue instead of each starting a thread
+_REPORT_POOL = ThreadPoolExecutor(max_workers=Config.REPORT_CONCURRENCY, thread_name_prefix="report-gen")
 @reports_bp.route('/compare', methods=['POST'])
 @token_required
 def compare_reports_endpoint(current_user):
@@ -57,10 +79,6 @@ def compare_reports_endpoint(current_user):
                 # Generate the PDF
                 generate_comparison_pdf(comparison_id, comparison_result)
                 
-                # Load the reports index
-                reports_index_file = os.path.join(Config.REPORTS_PATH, 'reports_index.json')
-                reports = load_reports_index()
-                
                 # Add the comparison report to the index
                 report_entry = {
                     'id': comparison_id,
@@ -70,20 +88,17 @@ def compare_reports_endpoint(current_user):
                     'environment': comparison_result['report1']['environment'],
                     'format': 'pdf',
                     'created_by': current_user['username'],
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': comparison_summary['created_at'],
                     'status': 'completed',
                     'filename': f"{comparison_id}.pdf",
                     'completed_at': datetime.now().isoformat()
                 }
                 
-                reports.append(report_entry)
-                save_reports_index(reports)
+                with_reports_index(lambda reports: reports.insert(0, report_entry))
                 
                 logger.info(f"Comparison report {comparison_id} generated successfully")
             except Exception as e:
-                logger.error(f"Error generating comparison report: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.exception("Error generating comparison report: %s", e)
         
         # Start the thread
         thread = threading.Thread(target=generate_pdf_thread)
@@ -93,9 +108,7 @@ def compare_reports_endpoint(current_user):
         return jsonify(comparison_summary), 201
         
     except Exception as e:
-        logger.error(f"Error in compare_reports endpoint: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error in compare_reports endpoint: %s", e)
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
 @reports_bp.route('/comparisons', methods=['GET'])
@@ -103,38 +116,20 @@ def compare_reports_endpoint(current_user):
 def get_comparisons(current_user):
     """Get all comparison reports"""
     try:
-        reports = load_reports_index()
-        
-        # Filter out only comparison reports
-        comparisons = [r for r in reports if r.get('type') == 'comparison']
-        
-        # Sort by creation date (newest first)
-        comparisons.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        # Create response with cache control headers
-        response = jsonify(comparisons)
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response, 200
+        # Filter out only comparison reports; the index is already newest first
+        return _index_list_response(
+            'comparisons', lambda reports: [r for r in reports if r.get('type') == 'comparison'])
     except Exception as e:
-        logger.error(f"Error in get_comparisons: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error in get_comparisons: %s", e)
         # Return empty array instead of error to prevent UI error
-        response = jsonify([])
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        return response, 200
+        return _empty_list_response()
 
 @reports_bp.route('/comparison/<comparison_id>/download', methods=['GET'])
 @token_required
 def download_comparison(current_user, comparison_id):
     """Download a comparison report"""
     try:
-        reports = load_reports_index()
-        
-        # Find the comparison by ID
-        comparison = next((r for r in reports if r['id'] == comparison_id), None)
+        comparison = find_report(comparison_id)
         
         if not comparison:
             return jsonify({'message': 'Comparison report not found'}), 404
@@ -152,21 +147,20 @@ def download_comparison(current_user, comparison_id):
         env = comparison.get('environment', 'environment')
         filename = f"jboss_comparison_{env}_{datetime.now().strftime('%Y%m%d')}_{comparison_id[:8]}.pdf"
         
-        # Return with cache control headers
+        # Reports never change once written, so let clients revalidate with If-None-Match/If-Modified-Since
         response = send_file(
             report_file,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(report_file)
         )
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
+        response.headers['Cache-Control'] = 'private, no-cache'
         return response
     except Exception as e:
-        logger.error(f"Error downloading comparison report: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error downloading comparison report: %s", e)
         return jsonify({'message': f'Error: {str(e)}'}), 500
 def get_report_file(report_id, format):
     """Get the report file path"""
@@ -177,20 +171,189 @@ def get_reports_index_file():
     """Get the reports index file path"""
     return os.path.join(Config.REPORTS_PATH, 'reports_index.json')
 
-def load_reports_index():
-    """Load reports index from file storage"""
-    index_file = get_reports_index_file()
-    if os.path.exists(index_file):
-        with open(index_file, 'r') as f:
+# Below this size mapping the file costs more than reading it
+_MMAP_MIN_SIZE = 64 * 1024
+
+def _read_index_file(index_file):
+    """Parse the index file; large files are parsed straight from a read-only mapping"""
+    with open(index_file, 'rb') as f:
+        if orjson is None:
             return json.load(f)
-    return []
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The view has to be released before the mapping can close
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def _cache_index(index_file, st, reports):
+    by_id = {r['id']: r for r in reports if 'id' in r}
+    with _index_cache_lock:
+        _INDEX_CACHE.update(path=index_file, mtime=st.st_mtime_ns, size=st.st_size, data=reports, by_id=by_id)
+    return reports, by_id, f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+def _cached_index():
+    """
+    Return the cached (reports, by_id, version) triple, re-reading the file only when it changed
+
+    version identifies the file content the data came from, None if there is no index yet.
+    """
+    index_file = get_reports_index_file()
+    try:
+        st = os.stat(index_file)
+    except FileNotFoundError:
+        return [], {}, None
+    
+    with _index_cache_lock:
+        if (_INDEX_CACHE['path'] == index_file and _INDEX_CACHE['mtime'] == st.st_mtime_ns
+                and _INDEX_CACHE['size'] == st.st_size):
+            return _INDEX_CACHE['data'], _INDEX_CACHE['by_id'], f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    
+    reports = _read_index_file(index_file)
+    # Files written before the index was kept sorted, or by other tools, may be in any order
+    reports.sort(key=_BY_CREATED, reverse=True)
+    return _cache_index(index_file, st, reports)
+
+def load_reports_index():
+    """Load reports index from file storage, skipping the parse when the file is unchanged"""
+    # Callers mutate entries before saving, so hand out copies
+    return [dict(r) for r in _cached_index()[0]]
+
+# Serialized list responses per view, reused until the index version changes
+_LIST_RESPONSE_CACHE = {}
+
+# Fallback for the list endpoints when the index can't be read
+_EMPTY_LIST_BODY = b'[]'
+_NO_STORE_HEADERS = {'Cache-Control': 'no-cache, no-store, must-revalidate'}
+
+def _empty_list_response():
+    """An uncacheable empty JSON list, so the UI shows nothing instead of an error"""
+    return current_app.response_class(_EMPTY_LIST_BODY, status=200, mimetype='application/json', headers=_NO_STORE_HEADERS)
+
+def _index_list_response(view, select):
+    """
+    JSON response for select(reports) with an ETag from the index version
+
+    A matching If-None-Match gets a 304 with no body, and repeat GETs reuse
+    the serialized body until the index file changes.
+    """
+    reports, _, version = _cached_index()
+    if version is None:
+        response = jsonify(select(reports))
+    else:
+        cached = _LIST_RESPONSE_CACHE.get(view)
+        if cached is None or cached[0] != version:
+            cached = _LIST_RESPONSE_CACHE[view] = (version, jsonify(select(reports)).get_data())
+        response = current_app.response_class(cached[1], mimetype='application/json')
+        response.set_etag(f"{view}-{version}")
+    
+    # Clients revalidate on every request, so the ETag is always checked
+    response.headers['Cache-Control'] = 'no-cache, must-revalidate'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '0'
+    return response.make_conditional(request)
+
+def find_report(report_id):
+    """Look up a single index entry by id without scanning the list; returns a copy or None"""
+    report = _cached_index()[1].get(report_id)
+    return dict(report) if report is not None else None
 
 def save_reports_index(reports):
-    """Save reports index to file storage"""
+    """Save reports index to file storage; written to a temp file and renamed so readers never see it half-written"""
+    index_file = get_reports_index_file()
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    reports.sort(key=_BY_CREATED, reverse=True)
+    if orjson is not None:
+        payload = orjson.dumps(reports, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = json.dumps(reports, separators=(',', ':')).encode()
+    
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_file), prefix='.reports_index-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    # What we just wrote is the file's content, no need to parse it on the next load
+    _cache_index(index_file, os.stat(index_file), [dict(r) for r in reports])
+
+class _IndexMutation:
+    """One caller's pending change to the reports index"""
+    __slots__ = ('mutator', 'result', 'error', 'done')
+
+    def __init__(self, mutator):
+        self.mutator = mutator
+        self.result = None
+        self.error = None
+        self.done = False
+
+# Mutations waiting for the next index write. Whichever caller gets the write
+# lock applies every pending one in a single load/save, so report threads that
+# finish together share one rewrite of the file instead of queueing for one each
+_pending_mutations = []
+_pending_lock = threading.Lock()
+_index_write_lock = threading.Lock()
+
+def _apply_mutations(batch):
     index_file = get_reports_index_file()
     os.makedirs(os.path.dirname(index_file), exist_ok=True)
-    with open(index_file, 'w') as f:
-        json.dump(reports, f, indent=2)
+    try:
+        with filelock.FileLock(index_file + '.lock', timeout=Config.REPORTS_INDEX_LOCK_TIMEOUT):
+            reports = load_reports_index()
+            for mutation in batch:
+                try:
+                    mutation.result = mutation.mutator(reports)
+                except Exception as e:
+                    mutation.error = e
+            save_reports_index(reports)
+    except Exception as e:
+        for mutation in batch:
+            mutation.error = mutation.error or e
+    finally:
+        for mutation in batch:
+            mutation.done = True
+
+def with_reports_index(mutator):
+    """
+    Load, mutate and save the reports index as one step under a file lock
+
+    mutator receives the report list and changes it in place; its return
+    value is handed back. Concurrent report threads can't lose each
+    other's updates this way, and their changes are written together.
+    """
+    mutation = _IndexMutation(mutator)
+    with _pending_lock:
+        _pending_mutations.append(mutation)
+    
+    with _index_write_lock:
+        # Another caller may have written this change while we waited for the lock
+        if not mutation.done:
+            with _pending_lock:
+                batch = _pending_mutations[:]
+                del _pending_mutations[:]
+            _apply_mutations(batch)
+    
+    if mutation.error is not None:
+        raise mutation.error
+    return mutation.result
+
+def _update_report(report_id, **fields):
+    """Return an index mutator that updates the fields of one report"""
+    def mutate(reports):
+        for r in reports:
+            if r['id'] == report_id:
+                r.update(fields)
+                return r
+        return None
+    return mutate
 
 @reports_bp.route('/', methods=['GET'])
 @reports_bp.route('', methods=['GET'])
@@ -207,25 +370,70 @@ def get_reports(current_user):
             with open(index_file, 'w') as f:
                 json.dump([], f)
         
-        reports = load_reports_index()
-        
-        # Sort by creation date (newest first)
-        reports.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        # Create response with cache control headers
-        response = jsonify(reports)
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response, 200
+        # Already sorted by creation date (newest first)
+        return _index_list_response('reports', lambda reports: reports)
     except Exception as e:
-        import traceback
-        print(f"Error in get_reports: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in get_reports: %s", e)
         # Return empty array instead of error to prevent UI error
-        response = jsonify([])
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        return response, 200
+        return _empty_list_response()
+
+# Status used for hosts that have never been checked; shared, so never mutate it
+_DEFAULT_STATUS = {'instance_status': 'unknown', 'datasources': (), 'deployments': (), 'last_check': None}
+
+# Host checks in progress per environment and JBoss credentials; reports requested
+# meanwhile with the same credentials wait for and reuse them
+_inflight_checks = {}
+_inflight_lock = threading.Lock()
+
+def _check_hosts(environment, hosts, username, password):
+    """
+    Check every host on the shared host check pool and return {host_id: status}
+
+    If a check of the same environment with the same credentials is already running
+    for another report, wait for it and reuse its results instead of polling every
+    JBoss host again. Callers with other credentials never see those results.
+    """
+    key = (environment, username, hashlib.sha256(password.encode()).hexdigest())
+    with _inflight_lock:
+        inflight = _inflight_checks.get(key)
+        if inflight is None:
+            inflight = _inflight_checks[key] = Future()
+            leader = True
+        else:
+            leader = False
+    
+    if not leader:
+        logger.info("Reusing the host check already running for %s", environment)
+        return inflight.result()
+    
+    try:
+        status_cache.refresh(environment)
+        executor = get_executor()
+        futures = {
+            executor.submit(monitor_host_inmem, environment, host, username, password): host['id']
+            for host in hosts
+        }
+
+        # Collect the fresh statuses in memory; nothing touches the disk per host
+        status = {}
+        for future in as_completed(futures):
+            try:
+                status[futures[future]] = future.result()
+            except Exception as e:
+                logger.error("Error updating host status: %s", e)
+
+        # Persist all checked hosts with a single status write
+        for host_id, host_status in status.items():
+            status_cache.update_host(environment, host_id, host_status)
+        status_cache.flush(environment)
+        inflight.set_result(status)
+        return status
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_checks.pop(key, None)
 
 @reports_bp.route('/<environment>/generate', methods=['POST'])  # No trailing slash
 @token_required
@@ -266,9 +474,7 @@ def generate_report(current_user, environment):
     os.makedirs(Config.REPORTS_PATH, exist_ok=True)
 
     # Update reports index
-    reports = load_reports_index()
-    reports.append(report)
-    save_reports_index(reports)
+    with_reports_index(lambda reports: reports.insert(0, report))
 
     # Get hosts for the environment
     hosts = load_hosts(environment)
@@ -276,90 +482,48 @@ def generate_report(current_user, environment):
     # Start a thread to generate the report
     def generate_report_thread():
         try:
-            print(f"Starting report generation for report ID: {report_id}")
+            logger.info("Starting report generation for report ID: %s", report_id)
             
-            # First, update all host statuses
-            with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
-                futures = []
-                for host in hosts:
-                    futures.append(
-                        executor.submit(monitor_host, environment, host, username, password)
-                    )
-
-                # Wait for all status updates to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        print(f"Error updating host status: {str(e)}")
-
-            # Load the updated status
-            status = load_status(environment)
+            # First, update all host statuses, sharing a check already running for this environment
+            status = _check_hosts(environment, hosts, username, password)
 
             # Combine hosts with their status
-            host_status = []
-            for host in hosts:
-                host_id = host['id']
-                host_status.append({
-                    **host,
-                    'status': status.get(host_id, {
-                        'instance_status': 'unknown',
-                        'datasources': [],
-                        'deployments': [],
-                        'last_check': None
-                    })
-                })
+            host_status = [
+                dict(host, status=status.get(host['id']) or status_cache.get_host(environment, host['id']) or _DEFAULT_STATUS)
+                for host in hosts
+            ]
 
-            # Generate the report file
+            # Generate the report file in a render process; this thread just waits without holding the GIL
             try:
-                report_path = generate_pdf_report(report_id, environment, host_status)
-                print(f"PDF report generated at: {report_path}")
+                report_path = submit_pdf_report(report_id, environment, host_status).result()
+                logger.info("PDF report generated at: %s", report_path)
             except Exception as e:
-                import traceback
-                print(f"Error generating report file: {str(e)}")
-                print(traceback.format_exc())
+                logger.exception("Error generating report file: %s", e)
                 raise
             
             # Update report status
-            reports = load_reports_index()
-            for r in reports:
-                if r['id'] == report_id:
-                    r['status'] = 'completed'
-                    r['completed_at'] = datetime.now().isoformat()
-                    break
-
-            save_reports_index(reports)
-            print(f"Report {report_id} marked as completed")
+            with_reports_index(_update_report(report_id, status='completed', completed_at=datetime.now().isoformat()))
+            logger.info("Report %s marked as completed", report_id)
 
             # Add report rotation after a successful report generation
             try:
                 rotate_reports(environment, max_reports=Config.MAX_REPORTS_PER_ENV)
-                print(f"Report rotation completed for {environment}")
+                logger.info("Report rotation completed for %s", environment)
             except Exception as rotation_error:
-                print(f"Error rotating reports: {str(rotation_error)}")
+                logger.error("Error rotating reports: %s", rotation_error)
 
         except Exception as e:
-            import traceback
-            print(f"Error in report generation thread: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Error in report generation thread: %s", e)
             
             # Update report status to failed
             try:
-                reports = load_reports_index()
-                for r in reports:
-                    if r['id'] == report_id:
-                        r['status'] = 'failed'
-                        r['error'] = str(e)
-                        break
-                save_reports_index(reports)
-                print(f"Report {report_id} marked as failed: {str(e)}")
+                with_reports_index(_update_report(report_id, status='failed', error=str(e)))
+                logger.info("Report %s marked as failed: %s", report_id, e)
             except Exception as e2:
-                print(f"Error updating report status: {str(e2)}")
+                logger.error("Error updating report status: %s", e2)
 
-    # Start report generation thread
-    report_thread = threading.Thread(target=generate_report_thread)
-    report_thread.daemon = True
-    report_thread.start()
+    # Queue report generation on the bounded report pool
+    _REPORT_POOL.submit(generate_report_thread)
 
     # Return immediately with the report info
     response = jsonify(report)
@@ -371,14 +535,7 @@ def generate_report(current_user, environment):
 def get_report(current_user, report_id):
     """Get report details"""
     try:
-        reports = load_reports_index()
-
-        # Find the report by ID
-        report = None
-        for r in reports:
-            if r['id'] == report_id:
-                report = r
-                break
+        report = find_report(report_id)
 
         if not report:
             return jsonify({'message': 'Report not found'}), 404
@@ -397,14 +554,7 @@ def get_report(current_user, report_id):
 def download_report(current_user, report_id):
     """Download a report file"""
     try:
-        reports = load_reports_index()
-
-        # Find the report by ID
-        report = None
-        for r in reports:
-            if r['id'] == report_id:
-                report = r
-                break
+        report = find_report(report_id)
 
         if not report:
             return jsonify({'message': 'Report not found'}), 404
@@ -418,55 +568,70 @@ def download_report(current_user, report_id):
         if not os.path.exists(report_file):
             return jsonify({'message': 'Report file not found'}), 404
 
+        # Clients that accept zstd get the compressed copy, when the generator left one
+        compressed_file = report_file + '.zst'
+        has_compressed = os.path.exists(compressed_file)
+        if has_compressed and request.accept_encodings.quality('zstd') > 0:
+            report_file = compressed_file
+            content_encoding = 'zstd'
+        else:
+            content_encoding = None
+
         # Set content type based on format
         content_type = 'application/pdf' if report['format'] == 'pdf' else 'text/csv'
 
         # Generate a more descriptive filename
         filename = f"jboss_monitor_{report['environment']}_{datetime.now().strftime('%Y%m%d')}_{report_id[:8]}.{report['format']}"
 
-        # Return with cache control headers
+        # Reports never change once written, so let clients revalidate with If-None-Match/If-Modified-Since
         response = send_file(
             report_file,
             mimetype=content_type,
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(report_file)
         )
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        if has_compressed:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'private, no-cache'
         return response
     except Exception as e:
-        import traceback
-        print(f"Error downloading report: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error downloading report: %s", e)
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
+def _remove_files(paths):
+    """Remove report files, ignoring any that are already gone"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Error deleting report file %s: %s", path, e)
+
 @reports_bp.route('/<report_id>', methods=['DELETE'])  # No trailing slash
 @token_required
 def delete_report(current_user, report_id):
     """Delete a report"""
     try:
-        reports = load_reports_index()
-
-        # Find the report by ID
-        report_index = None
-        for i, r in enumerate(reports):
-            if r['id'] == report_id:
-                report_index = i
-                report = r
-                break
+        # Find the report by ID and remove it from the index
+        def remove(reports):
+            for i, r in enumerate(reports):
+                if r['id'] == report_id:
+                    return reports.pop(i)
+            return None
 
-        if report_index is None:
+        report = with_reports_index(remove)
+        if report is None:
             return jsonify({'message': 'Report not found'}), 404
 
-        # Delete the report file
+        # Unlinking is cheap, so do it inline rather than queueing behind report renders
         report_file = get_report_file(report_id, report['format'])
-        if os.path.exists(report_file):
-            os.remove(report_file)
-
-        # Remove from index
-        del reports[report_index]
-        save_reports_index(reports)
+        _remove_files((report_file, report_file + '.zst'))
 
         # Return with cache control headers
         response = jsonify({
@@ -520,22 +685,26 @@ def debug_reports(current_user):
         index_content = None
         if index_exists:
             try:
-                with open(index_file, 'r') as f:
-                    index_content = json.load(f)
+                index_content = _read_index_file(index_file)
             except Exception as e:
                 index_content = f"Error reading index: {str(e)}"
         
-        # Check report files
+        # Check report files, one page at a time; only the entries on the page are stat'ed
+        limit = max(request.args.get('limit', 100, type=int), 0)
+        offset = max(request.args.get('offset', 0, type=int), 0)
         report_files = []
+        report_files_total = 0
         if dir_exists:
-            for f in os.listdir(reports_path):
-                if f.endswith('.pdf') or f.endswith('.csv'):
-                    file_path = os.path.join(reports_path, f)
-                    report_files.append({
-                        'name': f,
-                        'size': os.path.getsize(file_path),
-                        'modified': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                    })
+            with os.scandir(reports_path) as it:
+                entries = sorted((e for e in it if e.name.endswith(('.pdf', '.csv'))), key=lambda e: e.name)
+            report_files_total = len(entries)
+            for entry in entries[offset:offset + limit]:
+                st = entry.stat()
+                report_files.append({
+                    'name': entry.name,
+                    'size': st.st_size,
+                    'modified': datetime.fromtimestamp(st.st_mtime).isoformat()
+                })
         
         # Get config info
         config_info = {
@@ -550,6 +719,9 @@ def debug_reports(current_user):
             'index_exists': index_exists,
             'index_content': index_content,
             'report_files': report_files,
+            'report_files_total': report_files_total,
+            'limit': limit,
+            'offset': offset,
             'config': config_info
         }
         
@@ -1,16 +1,102 @@
 # reports/utils.py
 import os
 import json
+import heapq
 import logging
+import tempfile
+import filelock
 from datetime import datetime
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _created_at(report):
+    return report.get('created_at', '')
+
+def _load_index(reports_index_file):
+    with open(reports_index_file, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _save_index(reports_index_file, reports):
+    """Write the index to a temp file and rename it over the old one, so a crash never leaves it half-written"""
+    if orjson is not None:
+        payload = orjson.dumps(reports, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = json.dumps(reports, separators=(',', ':')).encode()
+    
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(reports_index_file), prefix='.reports_index-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, reports_index_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _rotate_in_memory(reports, environment, max_reports):
+    """
+    Drop the reports beyond the newest max_reports per environment from the list, in place
+
+    Entries without an id or format are kept, since their files can't be found.
+    Returns the dropped entries.
+    """
+    # Group reports by environment in one pass; all environments when none is given
+    by_env = {}
+    for report in reports:
+        if 'environment' in report and (environment is None or report['environment'] == environment):
+            by_env.setdefault(report['environment'], []).append(report)
+    
+    # Only the reports beyond the newest max_reports are needed, so skip the full sort
+    doomed = set()
+    for env_reports in by_env.values():
+        excess = len(env_reports) - max_reports
+        if excess > 0:
+            doomed.update(id(r) for r in heapq.nsmallest(excess, env_reports, key=_created_at)
+                          if r.get('id') and r.get('format'))
+    
+    if not doomed:
+        return []
+    removed = [r for r in reports if id(r) in doomed]
+    reports[:] = [r for r in reports if id(r) not in doomed]
+    return removed
+
+def _delete_report_files(report):
+    """Delete a rotated report's file and its compressed copy; True if the report file was there"""
+    report_file = os.path.join(Config.REPORTS_PATH, f"{report['id']}.{report['format']}")
+    deleted = False
+    try:
+        os.remove(report_file)
+        deleted = True
+        logger.info(f"Deleted old report file: {report_file}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error deleting report file {report_file}: {str(e)}")
+    
+    # The compressed download copy goes with it
+    try:
+        os.remove(report_file + '.zst')
+    except OSError:
+        pass
+    return deleted
+
 def rotate_reports(environment=None, max_reports=None):
     """
     Rotate reports to keep only the most recent ones (per environment if specified)
     
+    The index is read once and written once, however many environments are rotated.
+    
     Args:
         environment (str, optional): If provided, only rotate reports for this environment
         max_reports (int, optional): Maximum number of reports to keep per environment
@@ -29,70 +115,24 @@ def rotate_reports(environment=None, max_reports=None):
         return 0
     
     try:
-        # Load reports index
-        with open(reports_index_file, 'r') as f:
-            reports = json.load(f)
-        
-        if not reports:
-            return 0
-            
-        # Group reports by environment if environment is None
-        if environment is None:
-            # Process all environments
-            environments = set(report.get('environment') for report in reports if 'environment' in report)
-            total_deleted = 0
-            
-            for env in environments:
-                env_deleted = rotate_reports(env, max_reports)
-                total_deleted += env_deleted
-                
-            return total_deleted
-        
-        # Filter reports for the specified environment
-        env_reports = [r for r in reports if r.get('environment') == environment]
-        
-        # Sort by creation date (newest first)
-        env_reports.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        if len(env_reports) <= max_reports:
-            # No rotation needed
-            return 0
-        
-        # Get reports to delete
-        reports_to_delete = env_reports[max_reports:]
-        deleted_count = 0
-        
-        for report in reports_to_delete:
-            report_id = report.get('id')
-            report_format = report.get('format')
-            
-            if not report_id or not report_format:
-                continue
-                
-            # Delete report file
-            report_file = os.path.join(Config.REPORTS_PATH, f"{report_id}.{report_format}")
-            if os.path.exists(report_file):
-                try:
-                    os.remove(report_file)
-                    deleted_count += 1
-                    logger.info(f"Deleted old report file: {report_file}")
-                except Exception as e:
-                    logger.error(f"Error deleting report file {report_file}: {str(e)}")
+        # Same lock as the report routes' index updates, so neither overwrites the other's changes
+        with filelock.FileLock(reports_index_file + '.lock', timeout=Config.REPORTS_INDEX_LOCK_TIMEOUT):
+            reports = _load_index(reports_index_file)
+            removed = _rotate_in_memory(reports, environment, max_reports)
+            if not removed:
+                # No rotation needed
+                return 0
             
-            # Remove from index
-            reports.remove(report)
+            # Drop the entries first, so the index never lists a report whose file is gone
+            _save_index(reports_index_file, reports)
         
-        # Save updated index
-        with open(reports_index_file, 'w') as f:
-            json.dump(reports, f, indent=2)
+        deleted_count = sum(_delete_report_files(report) for report in removed)
             
-        logger.info(f"Rotated reports for {environment}: kept {max_reports}, deleted {deleted_count}")
+        logger.info(f"Rotated reports for {environment or 'all environments'}: kept {max_reports} per environment, deleted {deleted_count}")
         return deleted_count
         
     except Exception as e:
-        logger.error(f"Error rotating reports: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error rotating reports: %s", e)
         return 0
 
 def get_reports_file_path(report_id, format):
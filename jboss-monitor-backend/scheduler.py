@@ -0,0 +1,98 @@
+# scheduler.py
+import sched
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Set to wake the scheduler thread early, e.g. when a job is added or on shutdown
+_wakeup = threading.Event()
+_shutdown = threading.Event()
+
+def _delay(seconds):
+    """Sleep until the next event is due or something changed the queue"""
+    if _wakeup.wait(seconds):
+        _wakeup.clear()
+
+# One heap-ordered queue and one thread for every periodic maintenance job
+_scheduler = sched.scheduler(time.time, _delay)
+_jobs = {}
+_thread = None
+_thread_lock = threading.Lock()
+
+def _next_daily(hour, minute):
+    """Next local time at hour:minute, today if it is still ahead"""
+    now = datetime.now()
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return next_run
+
+def _run():
+    logger.info("Starting maintenance scheduler")
+    while True:
+        # run() returns once the queue is empty; wait for the next registration
+        _scheduler.run()
+        if _shutdown.is_set():
+            break
+        _wakeup.wait()
+        _wakeup.clear()
+    logger.info("Maintenance scheduler stopped")
+
+def _ensure_thread():
+    global _thread
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="maintenance-scheduler", daemon=True)
+            _thread.start()
+        return _thread
+
+def register_daily(hour, minute, fn, name=None, run_now=True):
+    """
+    Run fn every day at hour:minute local time on the shared scheduler thread
+
+    With run_now the first run happens immediately, as the old per-job
+    worker threads did on startup. Returns the scheduler thread.
+    """
+    name = name or fn.__name__
+
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            logger.error(f"Error in scheduled job {name}: {str(e)}")
+        finally:
+            if not _shutdown.is_set() and name in _jobs:
+                next_run = _next_daily(hour, minute)
+                logger.info(f"Next {name} scheduled for {next_run}")
+                _jobs[name] = _scheduler.enterabs(next_run.timestamp(), 0, run)
+
+    cancel_job(name)
+    if run_now:
+        _jobs[name] = _scheduler.enter(0, 0, run)
+    else:
+        _jobs[name] = _scheduler.enterabs(_next_daily(hour, minute).timestamp(), 0, run)
+    _wakeup.set()
+    return _ensure_thread()
+
+def cancel_job(name):
+    """Remove a registered job; a run already in progress finishes but is not rescheduled"""
+    event = _jobs.pop(name, None)
+    if event is not None:
+        try:
+            _scheduler.cancel(event)
+        except ValueError:
+            # Already running or done
+            pass
+
+def stop_scheduler():
+    """Cancel all jobs and let the scheduler thread exit"""
+    _shutdown.set()
+    for name in list(_jobs):
+        cancel_job(name)
+    _wakeup.set()
+
+atexit.register(stop_scheduler)
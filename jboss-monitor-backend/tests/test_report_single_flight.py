@@ -0,0 +1,117 @@
+# tests/test_report_single_flight.py
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from reports import routes
+
+
+class CountingLock:
+    """Wraps the in-flight lock so a test can wait until a caller has looked up its key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self.entries = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        with self._cond:
+            self.entries += 1
+            self._cond.notify_all()
+
+    def wait_for_entries(self, count):
+        with self._cond:
+            return self._cond.wait_for(lambda: self.entries >= count, timeout=5)
+
+
+class CheckHostsSingleFlightTest(unittest.TestCase):
+    HOSTS = [{'id': 'h1', 'host': 'h1.example', 'port': 9990}]
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.calls_lock = threading.Lock()
+        self.lock = CountingLock()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+        def check(environment, host, username, password):
+            with self.calls_lock:
+                self.calls.append((username, password))
+            self.release.wait(5)
+            return {'instance_status': 'up', 'checked_by': username}
+
+        patches = [
+            mock.patch.object(routes, '_inflight_lock', self.lock),
+            mock.patch.object(routes, '_inflight_checks', {}),
+            mock.patch.object(routes, 'monitor_host_inmem', check),
+            mock.patch.object(routes, 'get_executor', lambda: self.executor),
+            mock.patch.object(routes, 'status_cache', mock.MagicMock()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(self.release.set)
+
+    def _run(self, username, password, results):
+        def target():
+            results.append(routes._check_hosts('production', self.HOSTS, username, password))
+        thread = threading.Thread(target=target)
+        thread.start()
+        return thread
+
+    def _wait_for_calls(self, count):
+        for _ in range(500):
+            with self.calls_lock:
+                if len(self.calls) >= count:
+                    return
+            self.release.wait(0.01)
+        self.fail(f"expected {count} host checks, saw {len(self.calls)}")
+
+    def test_same_credentials_share_the_running_check(self):
+        leader, follower = [], []
+        threads = [self._run('admin', 'secret', leader)]
+        self._wait_for_calls(1)
+        threads.append(self._run('admin', 'secret', follower))
+        self.assertTrue(self.lock.wait_for_entries(2))
+
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertIs(follower[0], leader[0])
+
+    def test_other_credentials_run_their_own_check(self):
+        first, other_user, other_password = [], [], []
+        threads = [self._run('admin', 'secret', first)]
+        self._wait_for_calls(1)
+        threads.append(self._run('auditor', 'secret', other_user))
+        threads.append(self._run('admin', 'rotated', other_password))
+        self._wait_for_calls(3)
+
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(sorted(self.calls), [('admin', 'rotated'), ('admin', 'secret'), ('auditor', 'secret')])
+        self.assertEqual(other_user[0]['h1']['checked_by'], 'auditor')
+        self.assertIsNot(other_password[0], first[0])
+
+    def test_finished_check_is_not_reused(self):
+        self.release.set()
+        first = routes._check_hosts('production', self.HOSTS, 'admin', 'secret')
+        second = routes._check_hosts('production', self.HOSTS, 'admin', 'secret')
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertIsNot(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_status_shards.py
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from config import Config
+from monitor import utils
+
+
+class StatusShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='jboss-monitor-test-')
+        self.orig_path = Config.PROD_ENV_PATH
+        Config.PROD_ENV_PATH = self.tmp
+        utils._LAST_SAVE.clear()
+
+    def tearDown(self):
+        Config.PROD_ENV_PATH = self.orig_path
+        utils._LAST_SAVE.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _shard_ids(self):
+        return set(utils._list_shards(utils.get_status_dir('production')))
+
+    def test_legacy_status_file_is_read_until_the_first_save(self):
+        legacy = {'_last_check': 'then', 'a': {'instance_status': 'up'}}
+        with open(os.path.join(self.tmp, 'status.json'), 'w') as f:
+            json.dump(legacy, f)
+
+        self.assertEqual(utils.load_status('production'), legacy)
+
+        utils.save_status({'_last_check': 'now', 'b': {'instance_status': 'down'}}, 'production')
+
+        status = utils.load_status('production')
+        self.assertEqual(status['_last_check'], 'now')
+        self.assertEqual(status['b'], {'instance_status': 'down'})
+        self.assertNotIn('a', status)
+
+    def test_one_shard_per_host_and_metadata_in_the_index(self):
+        utils.save_status({'_last_check': 'now', 'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production')
+
+        self.assertEqual(self._shard_ids(), {'a', 'b'})
+        with open(utils.get_status_file('production')) as f:
+            index = json.load(f)
+        self.assertEqual(index['meta']['_last_check'], 'now')
+        self.assertNotIn('a', index)
+
+    def test_removed_hosts_lose_their_shard(self):
+        utils.save_status({'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production')
+
+        utils.save_status({'a': {'instance_status': 'up'}}, 'production', dirty=set())
+
+        self.assertEqual(self._shard_ids(), {'a'})
+        self.assertNotIn('b', utils.load_status('production'))
+
+    def test_only_dirty_and_new_hosts_are_rewritten(self):
+        utils.save_status({'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production')
+
+        status = {'a': {'instance_status': 'down'}, 'b': {'instance_status': 'down'}, 'c': {'instance_status': 'up'}}
+        utils.save_status(status, 'production', dirty={'b'})
+
+        status = utils.load_status('production')
+        self.assertEqual(status['a'], {'instance_status': 'up'})
+        self.assertEqual(status['b'], {'instance_status': 'down'})
+        self.assertEqual(status['c'], {'instance_status': 'up'})
+
+    def test_load_selected_hosts(self):
+        utils.save_status({'_last_check': 'now', 'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production')
+
+        status = utils.load_status('production', host_ids=['b'])
+
+        self.assertEqual(status, {'_last_check': 'now', '_last_updated': status['_last_updated'], 'b': {'instance_status': 'up'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
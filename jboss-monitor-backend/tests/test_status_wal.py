@@ -0,0 +1,57 @@
+# tests/test_status_wal.py
+import shutil
+import tempfile
+import unittest
+
+from config import Config
+from monitor import utils
+
+
+class StatusWalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='jboss-monitor-test-')
+        self.orig_path = Config.PROD_ENV_PATH
+        Config.PROD_ENV_PATH = self.tmp
+        utils._LAST_SAVE.clear()
+
+    def tearDown(self):
+        Config.PROD_ENV_PATH = self.orig_path
+        utils._LAST_SAVE.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_full_save_keeps_logged_updates(self):
+        utils.save_status({'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production')
+
+        # A snapshot taken before a single-host update is logged
+        snapshot = utils.load_status('production')
+        utils.enqueue_status('production', 'b', {'instance_status': 'down'})
+        utils.flush_status_sync()
+
+        snapshot['a'] = {'instance_status': 'down'}
+        utils.save_status(snapshot, 'production', dirty=None, fresh={'a'})
+
+        status = utils.load_status('production')
+        self.assertEqual(status['a'], {'instance_status': 'down'})
+        self.assertEqual(status['b'], {'instance_status': 'down'})
+
+    def test_fresh_hosts_keep_the_callers_version(self):
+        utils.save_status({'a': {'instance_status': 'up'}}, 'production')
+        utils.enqueue_status('production', 'a', {'instance_status': 'down'})
+        utils.flush_status_sync()
+
+        utils.save_status({'a': {'instance_status': 'error'}}, 'production', dirty=None, fresh={'a'})
+
+        self.assertEqual(utils.load_status('production')['a'], {'instance_status': 'error'})
+
+    def test_latest_logged_update_wins(self):
+        utils.save_status({'a': {'instance_status': 'up'}}, 'production')
+        utils.append_status_delta('a', {'instance_status': 'down'}, 'production')
+        utils.append_status_delta('a', {'instance_status': 'error'}, 'production')
+
+        utils.save_status({'a': {'instance_status': 'up'}, 'b': {'instance_status': 'up'}}, 'production', dirty={'b'})
+
+        self.assertEqual(utils.load_status('production')['a'], {'instance_status': 'error'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
+import json
+import shutil
+import argparse
+import hashlib
+import importlib.util
 import signal
+import subprocess
+import selectors
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Get the absolute path of the project root directory
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -12,58 +19,124 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 # Configuration - use absolute paths
 BACKEND_DIR = os.path.join(PROJECT_ROOT, 'jboss-monitor-backend')
 FRONTEND_DIR = os.path.join(PROJECT_ROOT, 'jboss-monitor-frontend')
+BACKEND_COMMAND = [sys.executable, '-m', 'flask', 'run', '--host=0.0.0.0', '--port=5000']
+
+def get_backend_env():
+    backend_env = os.environ.copy()
+    backend_env['FLASK_ENV'] = 'development'
+    backend_env['FLASK_DEBUG'] = '1'
+    return backend_env
+
+def exec_backend():
+    """Replace this process with the backend server, which then writes to the terminal itself"""
+    os.chdir(BACKEND_DIR)
+    os.execve(sys.executable, BACKEND_COMMAND, get_backend_env())
+
+# Passing dependency checks are remembered for a day, until the tools they ran against change
+DEPS_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'jboss-monitor', 'deps.json')
+DEPS_CACHE_TTL = 24 * 60 * 60
+
+def deps_cache_key():
+    """Fingerprint of the interpreter, PATH and tool installs the dependency checks depend on"""
+    parts = [sys.executable, os.environ.get('PATH', '')]
+    for tool in ('node', 'npm'):
+        path = shutil.which(tool)
+        parts.append(f"{path}:{os.stat(path).st_mtime_ns}" if path else '')
+    spec = importlib.util.find_spec('flask')
+    parts.append(f"{spec.origin}:{os.stat(spec.origin).st_mtime_ns}" if spec and spec.origin else '')
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+def deps_cached(key):
+    try:
+        with open(DEPS_CACHE_FILE) as f:
+            checked_at = json.load(f).get(key)
+    except (OSError, ValueError):
+        return False
+    return checked_at is not None and time.time() - checked_at < DEPS_CACHE_TTL
+
+def remember_deps(key):
+    try:
+        os.makedirs(os.path.dirname(DEPS_CACHE_FILE), exist_ok=True)
+        with open(DEPS_CACHE_FILE, 'w') as f:
+            json.dump({key: time.time()}, f)
+    except OSError:
+        pass
 
 class ApplicationManager:
     def __init__(self):
         self.processes = []
         self.stop_event = threading.Event()
+        # Output of both servers is forwarded from one loop instead of a blocking thread per server
+        self.selector = selectors.DefaultSelector()
+
+    def _watch(self, process, prefix):
+        """Forward the process's output from the event loop, each line tagged with prefix"""
+        self.processes.append(process)
+        self.selector.register(process.stdout, selectors.EVENT_READ, (prefix, bytearray()))
+
+    def _write(self, data):
+        # Flush any print() output first so the two don't interleave out of order
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    def _forward(self, key):
+        """Print the complete lines a server has written so far; returns False once its output is closed"""
+        prefix, pending = key.data
+        chunk = os.read(key.fd, 65536)
+        if not chunk:
+            self.selector.unregister(key.fileobj)
+            if pending:
+                self._write(prefix + bytes(pending).rstrip() + b'\n')
+            return False
+        pending += chunk
+        end = pending.rfind(b'\n')
+        if end >= 0:
+            self._write(b''.join(prefix + line.rstrip() + b'\n' for line in pending[:end].split(b'\n')))
+            del pending[:end + 1]
+        return True
+
+    def _drain(self):
+        """Forward whatever output is already waiting, without blocking"""
+        while any([self._forward(key) for key, _ in self.selector.select(timeout=0)]):
+            pass
 
     def start_backend(self):
         """Start the backend Flask server"""
-        os.chdir(BACKEND_DIR)
-        backend_env = os.environ.copy()
-        backend_env['FLASK_ENV'] = 'development'
-        backend_env['FLASK_DEBUG'] = '1'
-        
         try:
             backend_process = subprocess.Popen(
-                [sys.executable, '-m', 'flask', 'run', '--host=0.0.0.0', '--port=5000'],
-                env=backend_env,
+                BACKEND_COMMAND,
+                cwd=BACKEND_DIR,
+                env=get_backend_env(),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True
+                bufsize=0,
+                # Own process group, so shutdown also reaches the reloader and npm's node child
+                start_new_session=True
             )
-            self.processes.append(backend_process)
+            self._watch(backend_process, b'[BACKEND] ')
             print("\n🔵 Backend server started on http://localhost:5000")
-            
-            # Stream backend logs
-            for line in backend_process.stdout:
-                print(f"[BACKEND] {line.strip()}")
         except Exception as e:
             print(f"Failed to start backend: {e}")
 
     def start_frontend(self):
         """Start the React frontend development server"""
-        os.chdir(FRONTEND_DIR)
-        
         try:
             frontend_process = subprocess.Popen(
                 ['npm', 'start'],
+                cwd=FRONTEND_DIR,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True
+                bufsize=0,
+                # Own process group, so shutdown also reaches the reloader and npm's node child
+                start_new_session=True
             )
-            self.processes.append(frontend_process)
+            self._watch(frontend_process, b'[FRONTEND] ')
             print("\n🟢 Frontend server started on http://localhost:3000")
-            
-            # Stream frontend logs
-            for line in frontend_process.stdout:
-                print(f"[FRONTEND] {line.strip()}")
         except Exception as e:
             print(f"Failed to start frontend: {e}")
-            print(f"Current directory: {os.getcwd()}")
             print(f"Frontend directory: {FRONTEND_DIR}")
-            print(f"Directory contents: {os.listdir()}")
+            print(f"Directory contents: {os.listdir(FRONTEND_DIR)}")
 
     def start(self):
         """Start both backend and frontend"""
@@ -76,49 +149,84 @@ class ApplicationManager:
             print(f"❌ Frontend directory not found: {FRONTEND_DIR}")
             return
 
-        # Start backend and frontend threads
-        backend_thread = threading.Thread(target=self.start_backend)
-        frontend_thread = threading.Thread(target=self.start_frontend)
-        
-        backend_thread.start()
-        frontend_thread.start()
+        # The servers run in their own sessions, so a kill or a closed terminal only
+        # reaches this launcher; turn those into the same shutdown as Ctrl+C
+        for sig in (signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, self._exit_on_signal)
+
+        # Start backend and frontend; their logs are streamed while waiting
+        try:
+            self.start_backend()
+            self.start_frontend()
+        except (KeyboardInterrupt, SystemExit):
+            self.shutdown()
         
         # Wait for interrupt
         self.wait_for_interrupt()
 
+    def _exit_on_signal(self, signum, frame):
+        raise SystemExit(128 + signum)
+
     def wait_for_interrupt(self):
-        """Wait for keyboard interrupt and handle graceful shutdown"""
+        """Stream server logs until keyboard interrupt, or until either server exits, and handle graceful shutdown"""
         try:
-            # Wait for keyboard interrupt
-            signal.pause()
+            while not self.stop_event.is_set():
+                for key, _ in self.selector.select(timeout=0.2):
+                    self._forward(key)
+                for process in self.processes:
+                    if process.poll() is not None:
+                        # Show the last output, e.g. a traceback, before saying it exited
+                        self._drain()
+                        print(f"\n⚠️ {' '.join(process.args)} exited with code {process.returncode}")
+                        self.stop_event.set()
+                        break
         except (KeyboardInterrupt, SystemExit):
-            self.shutdown()
+            pass
+        self.shutdown()
+
+    def _signal_group(self, process, sig):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            # The group is already gone
+            pass
+        except Exception as e:
+            print(f"Error signalling process: {e}")
 
     def shutdown(self):
         """Gracefully terminate all processes"""
+        # A second signal must not cut the cleanup short
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_IGN)
         print("\n🛑 Shutting down...")
         
-        # Terminate all processes
+        # Terminate each server's whole process group
         for process in self.processes:
-            try:
-                process.terminate()
-            except Exception as e:
-                print(f"Error terminating process: {e}")
-        
-        # Wait a moment for processes to terminate
-        time.sleep(1)
+            self._signal_group(process, signal.SIGTERM)
         
-        # Force kill if still running
+        # Give them up to a second in total, then force kill what is left
+        deadline = time.monotonic() + 1
         for process in self.processes:
             try:
-                process.kill()
-            except Exception as e:
-                print(f"Error killing process: {e}")
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                pass
+            # Children of an exited server may still be running in its group
+            self._signal_group(process, signal.SIGKILL)
+            process.wait()
         
         print("✅ Application shutdown complete.")
         sys.exit(0)
 
 def main():
+    parser = argparse.ArgumentParser(description="Start the JBoss Monitor backend and frontend")
+    parser.add_argument('--exec-backend', action='store_true',
+                        help="run only the backend, in place of this launcher, without log forwarding")
+    args = parser.parse_args()
+
+    if args.exec_backend:
+        exec_backend()
+
     # Check dependencies before starting
     def check_dependency(name, check_cmd):
         try:
@@ -135,8 +243,19 @@ def main():
         ("Flask", [sys.executable, "-m", "flask", "--version"])
     ]
 
-    # Check all dependencies
-    if all(check_dependency(name, " ".join(map(str, cmd))) for name, cmd in dependencies):
+    # Check all dependencies, unless they passed recently against the same installs
+    cache_key = deps_cache_key()
+    if deps_cached(cache_key):
+        deps_ok = True
+    else:
+        # Each check mostly waits on its subprocess, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(dependencies)) as pool:
+            results = list(pool.map(lambda dep: check_dependency(dep[0], " ".join(map(str, dep[1]))), dependencies))
+        deps_ok = all(results)
+        if deps_ok:
+            remember_deps(cache_key)
+
+    if deps_ok:
         # Start the application
         app_manager = ApplicationManager()
         app_manager.start()